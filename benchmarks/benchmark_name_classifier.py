@@ -0,0 +1,92 @@
+"""
+Compare NameClassifier with the original per-keyword substring loop.
+
+The original main loop ran `any(keyword in name ...)` over the anonymous list
+and then over the organization list for every row. This benchmark checks both
+approaches classify the same synthetic names identically and times them with the
+default keyword lists and with a large generated organization list.
+
+Usage:
+    python -m benchmarks.benchmark_name_classifier --names 200k --extra-org-keywords 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from data_transformation.constants import anonymous_keywords, organization_keywords
+from data_transformation.name_classifier import NameClassifier
+
+from .synthetic_data import (anonymous_names, common_first_names, common_last_names, name_syllables,
+                             organization_names, parse_size)
+
+
+def keyword_loop_classify(name, anonymous, organizations):
+    # The classification rule as originally written in run_data_transformation.py.
+    if any(keyword in name for keyword in anonymous):
+        return NameClassifier.ANONYMOUS
+    if any(keyword in name for keyword in organizations):
+        return NameClassifier.ORGANIZATION
+    return NameClassifier.PERSON
+
+
+def generate_names(count, seed=2025):
+    rng = random.Random(seed)
+    names = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.03:
+            names.append(rng.choice(anonymous_names).lower())
+        elif roll < 0.13:
+            names.append(rng.choice(organization_names).lower())
+        else:
+            names.append(f"{rng.choice(common_last_names)}|{rng.choice(common_first_names)}".lower())
+    return names
+
+
+def generate_keywords(count, seed=2025):
+    rng = random.Random(seed + 1)
+    return ["".join(rng.choice(name_syllables) for _ in range(rng.randint(3, 4))) + " " +
+            rng.choice(["holdings", "partners", "group", "ministries", "trust", "associates"])
+            for _ in range(count)]
+
+
+def compare(names, anonymous, organizations, label):
+    classifier = NameClassifier(anonymous, organizations)
+    normalized_anonymous = classifier.anonymous_keywords
+    normalized_organizations = classifier.organization_keywords
+
+    start = time.perf_counter()
+    expected = [keyword_loop_classify(name, normalized_anonymous, normalized_organizations) for name in names]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [classifier.classify(name) for name in names]
+    classifier_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for left, right in zip(expected, actual) if left != right)
+    print(f"{label} ({len(normalized_organizations)} organization keywords)")
+    print(f"  keyword loop    {loop_seconds:8.3f}s  {len(names) / loop_seconds:>12,.0f} names/s")
+    print(f"  NameClassifier  {classifier_seconds:8.3f}s  {len(names) / classifier_seconds:>12,.0f} names/s  "
+          f"({loop_seconds / classifier_seconds:.1f}x)")
+    print(f"  mismatches      {mismatches}")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark NameClassifier against the keyword loop.")
+    parser.add_argument("--names", default="200k", help="Number of names to classify, e.g. 200k.")
+    parser.add_argument("--extra-org-keywords", type=int, default=5000,
+                        help="Size of the generated organization keyword list for the second run.")
+    args = parser.parse_args(argv)
+
+    names = generate_names(parse_size(args.names))
+    mismatches = compare(names, anonymous_keywords, organization_keywords, "Default keyword lists")
+    large_list = list(organization_keywords) + generate_keywords(args.extra_org_keywords)
+    mismatches += compare(names, anonymous_keywords, large_list, "Large keyword list")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
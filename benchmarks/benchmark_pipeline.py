@@ -0,0 +1,231 @@
+"""
+Benchmark each stage of the transformation pipeline on synthetic data.
+
+Times CSVHandler.read (parsing the CSV and from a warm parsed-input cache),
+AddressParser.transform_address, contact loading through DatabaseConnector,
+the enrichment loop and CSVWriter.write_csv separately, reports throughput and peak memory (tracemalloc), and compares the results with
+a stored baseline so regressions show up before a release.
+
+Usage:
+    python -m benchmarks.benchmark_pipeline --sizes 10k 100k
+    python -m benchmarks.benchmark_pipeline --sizes 10k --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from data_transformation.csv_handler import CSVHandler, CSVWriter
+from data_transformation.data_transformation import AddressParser, DatabaseConnector
+from data_transformation.run_stats import RunStats
+from run_data_transformation import headers, title_case_addresses, transform_records
+
+from .synthetic_data import generate_dataset, parse_size
+
+
+benchmark_directory = os.path.dirname(os.path.abspath(__file__))
+default_data_directory = os.path.join(benchmark_directory, "data")
+default_baseline_path = os.path.join(benchmark_directory, "baseline.json")
+
+stage_names = ["read", "read_cached", "address_parsing", "contact_load", "enrichment", "write"]
+
+
+def _run_stage(stage_function, measure_memory):
+    # Time the stage, then optionally run it again under tracemalloc for its peak memory,
+    # so the tracing overhead never leaks into the timings.
+    start = time.perf_counter()
+    result = stage_function()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            stage_function()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak_mb
+
+
+def benchmark_size(rows, data_directory, backend="memory", measure_memory=True, seed=2025):
+    """
+    Run every stage once for a dataset of the given size.
+
+    Returns:
+        dict: stage name -> {"seconds", "rows", "rows_per_second", "peak_mb"}
+    """
+    donation_path, contact_path = generate_dataset(data_directory, rows, seed)
+    work_directory = os.path.join(data_directory, f"work_{rows}")
+    os.makedirs(work_directory, exist_ok=True)
+    results = {}
+
+    def record(name, row_count, seconds, peak_mb):
+        results[name] = {
+            "seconds": round(seconds, 6),
+            "rows": row_count,
+            "rows_per_second": round(row_count / seconds, 1) if seconds else None,
+            "peak_mb": round(peak_mb, 2) if peak_mb is not None else None,
+        }
+
+    previous_directory = os.getcwd()
+    # DatabaseConnector writes contact_info.db to the working directory.
+    os.chdir(work_directory)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            def read_stage():
+                handler = CSVHandler(donation_path, use_cache=False)
+                handler.read()
+                return handler.get_records()
+            records, seconds, peak_mb = _run_stage(read_stage, measure_memory)
+            record("read", len(records), seconds, peak_mb)
+
+            # The same read served from a warm parsed-input cache.
+            cache_directory = os.path.join(work_directory, "parsed_cache")
+            CSVHandler(donation_path, use_cache=True, cache_directory=cache_directory).read()
+
+            def read_cached_stage():
+                handler = CSVHandler(donation_path, use_cache=True, cache_directory=cache_directory)
+                handler.read()
+                return handler.get_records()
+            cached_records, seconds, peak_mb = _run_stage(read_cached_stage, measure_memory)
+            record("read_cached", len(cached_records), seconds, peak_mb)
+            del cached_records
+
+            original_addresses = [row.get("Address", "") for row in records]
+
+            def address_stage():
+                parser = AddressParser()
+                for row, original_address in zip(records, original_addresses):
+                    row["Address"] = parser.transform_address(original_address)
+            _, seconds, peak_mb = _run_stage(address_stage, measure_memory)
+            record("address_parsing", len(records), seconds, peak_mb)
+
+            database_conn = DatabaseConnector(backend=backend)
+
+            def contact_stage():
+                database_conn.check_and_drop_table()
+                database_conn.create_table()
+                inserted, _ = database_conn.bulk_insert_records(
+                    title_case_addresses(CSVHandler(contact_path, use_cache=False).iter_records()))
+                if database_conn.backend == "memory":
+                    database_conn.get_contact_index()
+                return inserted
+            inserted, seconds, peak_mb = _run_stage(contact_stage, measure_memory)
+            record("contact_load", inserted, seconds, peak_mb)
+
+            def enrichment_stage():
+                return list(transform_records(records, database_conn, RunStats()))
+            output_rows, seconds, peak_mb = _run_stage(enrichment_stage, measure_memory)
+            record("enrichment", len(records), seconds, peak_mb)
+
+            csv_writer = CSVWriter()
+            csv_writer.output_directory = work_directory
+
+            def write_stage():
+                csv_writer.write_csv([headers] + output_rows, filename_suffix="benchmark")
+            _, seconds, peak_mb = _run_stage(write_stage, measure_memory)
+            record("write", len(output_rows), seconds, peak_mb)
+
+            database_conn.close_connection()
+    finally:
+        os.chdir(previous_directory)
+
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Return a list of human readable regressions where a stage is more than
+    tolerance (a fraction) slower than the baseline for the same size.
+    """
+    regressions = []
+    for size, stages in results.items():
+        for name, current in stages.items():
+            previous = baseline.get(size, {}).get(name)
+            if not previous or not previous.get("seconds"):
+                continue
+            ratio = current["seconds"] / previous["seconds"]
+            if ratio > 1 + tolerance:
+                regressions.append(f"{size} {name}: {current['seconds']:.3f}s vs baseline "
+                                   f"{previous['seconds']:.3f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def format_report(results, baseline=None):
+    lines = []
+    for size, stages in results.items():
+        lines.append(f"\n{size} rows")
+        lines.append(f"  {'stage':<16} {'seconds':>10} {'rows/s':>12} {'peak MB':>9} {'vs base':>8}")
+        for name in stage_names:
+            stage = stages[name]
+            previous = (baseline or {}).get(size, {}).get(name)
+            change = f"{stage['seconds'] / previous['seconds']:.2f}x" if previous and previous.get("seconds") else "-"
+            rate = f"{stage['rows_per_second']:,.0f}" if stage["rows_per_second"] else "-"
+            peak = f"{stage['peak_mb']:.1f}" if stage["peak_mb"] is not None else "-"
+            lines.append(f"  {name:<16} {stage['seconds']:>10.3f} {rate:>12} {peak:>9} {change:>8}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the donation transformation pipeline.")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k"],
+                        help="Dataset sizes to run, e.g. 10k 100k 1M 10M.")
+    parser.add_argument("--backend", choices=DatabaseConnector.backends, default="memory",
+                        help="DatabaseConnector lookup backend used by the enrichment stage.")
+    parser.add_argument("--data-dir", default=default_data_directory,
+                        help="Where synthetic CSVs and scratch output are kept.")
+    parser.add_argument("--baseline", default=default_baseline_path, help="Baseline JSON file.")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline before failing (0.2 = 20%%).")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory pass.")
+    parser.add_argument("--output", help="Also write the results as JSON to this path.")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        rows = parse_size(size)
+        print(f"Benchmarking {rows} rows...")
+        results[str(rows)] = benchmark_size(rows, args.data_dir, backend=args.backend,
+                                            measure_memory=not args.no_memory)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file).get("results", {})
+
+    print(format_report(results, baseline))
+
+    report = {"python": sys.version.split()[0], "platform": platform.platform(),
+              "backend": args.backend, "results": results}
+    if args.output:
+        with open(args.output, mode="w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, mode="w", encoding="utf-8") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if baseline:
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Deterministic synthetic data for benchmarking the transformation pipeline.
+
+Generates a donation CSV (required_headers) and a contact CSV
+(contact_list_headers) with realistic shapes: common and generated surnames,
+donors who give repeatedly from the same address, organizations, anonymous
+gifts and the messy address spellings AddressParser has to clean up.
+
+Usage:
+    python -m benchmarks.synthetic_data --rows 100k --output-dir benchmarks/data
+"""
+
+import argparse
+import csv
+import os
+import random
+
+from data_transformation.constants import required_headers, contact_list_headers
+
+
+common_last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+                     "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+                     "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+                     "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson"]
+
+common_first_names = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+                      "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+                      "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Lisa", "Daniel", "Nancy",
+                      "Matthew", "Betty", "Anthony", "Sandra", "Mark", "Ashley", "Jon", "Mike", "Liz"]
+
+name_syllables = ["an", "ber", "cal", "dor", "el", "fen", "gar", "hol", "is", "jen", "kel", "lin",
+                  "mor", "nel", "os", "pen", "quin", "ros", "sten", "tor", "ul", "van", "wes", "yor"]
+
+organization_names = ["First Baptist Church", "Aggieland Automotive LLC", "Brazos Valley Foundation",
+                      "Kroger", "Class of 1990", "Bryan Bible Fellowship", "Vanguard Charitable",
+                      "Brazos Plumbing Inc", "Aggieland Sales Company", "New Beginnings Club",
+                      "Chi Omega Fraternity", "Elm Street Studio", "BCS Investment Firm",
+                      "Texas Enterprise Offices", "Luke Bryans Foundation"]
+
+anonymous_names = ["Anonymous", "ANONYMOUS", "Unknown", "Cash Donation", "annonomus"]
+
+street_names = ["Main", "Oak", "Pine", "University", "Texas", "Harvey", "Wellborn", "Rock Prairie",
+                "Holleman", "George Bush", "Briarcrest", "Villa Maria", "Southwest", "Elm"]
+
+street_types = ["Street", "St", "Dr.", "Dr", "Circle", "Ave", "Blvd", "Rd", "Pkwy"]
+
+cities = [("College Station", 0.35), ("Bryan", 0.25), ("CS", 0.05), ("Houston", 0.12),
+          ("Austin", 0.08), ("Dallas", 0.08), ("San Antonio", 0.07)]
+
+states = [("TX", 0.5), ("Texas", 0.2), ("", 0.25), ("tx", 0.05)]
+
+funds = ["general fund", "BUILDING FUND", "Missions", "scholarship", "Youth Programs"]
+campaigns = ["spring drive", "annual gala", "GIVING TUESDAY", "year end appeal", ""]
+appeals = ["Mailer", "Email", "Event", ""]
+methods = ["check", "CASH", "credit card", "ach", "Stock"]
+
+size_suffixes = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(value):
+    """
+    Parse a row count such as "10k", "1M" or "2500".
+    """
+    text = str(value).strip().lower()
+    if text and text[-1] in size_suffixes:
+        return int(float(text[:-1]) * size_suffixes[text[-1]])
+    return int(text)
+
+
+def _weighted(rng, choices):
+    values = [choice for choice, _ in choices]
+    weights = [weight for _, weight in choices]
+    return rng.choices(values, weights)[0]
+
+
+def _surname(rng):
+    # Mostly common surnames, with a long tail of generated ones for realistic cardinality.
+    if rng.random() < 0.6:
+        return rng.choice(common_last_names)
+    return "".join(rng.choice(name_syllables) for _ in range(rng.randint(2, 3))).title()
+
+
+def _address(rng):
+    number = str(rng.randint(1, 19999))
+    street = rng.choice(street_names)
+    street_type = rng.choice(street_types)
+    if rng.random() < 0.05:
+        street_line = f"{number}{street} {street_type}"  # merged house number
+    else:
+        street_line = f"{number} {street} {street_type}"
+    if rng.random() < 0.1:
+        street_line += f" #{rng.randint(1, 400)}"
+    return street_line, _weighted(rng, cities), str(rng.randint(77000, 79999))
+
+
+def _donation_address(rng, address):
+    roll = rng.random()
+    if roll < 0.04:
+        return ""
+    if roll < 0.07:
+        return "see attached"
+    street_line, city, zipcode = address
+    state = _weighted(rng, states)
+    separator = "|" if rng.random() < 0.2 else " "
+    parts = [street_line, city, state, zipcode]
+    return separator.join(part for part in parts if part)
+
+
+def _date(rng):
+    month, day = rng.randint(1, 12), rng.randint(1, 28)
+    roll = rng.random()
+    if roll < 0.7:
+        return f"{month}/{day}/2024"
+    if roll < 0.95:
+        return f"{month:02d}/{day:02d}/2024"
+    return ""
+
+
+def build_donor_population(rows, seed=2025):
+    """
+    Return a deterministic list of (last_name, first_name, address) donors.
+    """
+    rng = random.Random(seed)
+    population = max(10, rows // 3)
+    return [(_surname(rng), rng.choice(common_first_names), _address(rng)) for _ in range(population)]
+
+
+def generate_contact_csv(file_path, rows, seed=2025):
+    """
+    Write a contact list CSV with the given number of rows.
+    """
+    rng = random.Random(seed + 1)
+    donors = build_donor_population(rows, seed)
+    with open(file_path, mode="w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(contact_list_headers)
+        for donor_id in range(1, rows + 1):
+            if donor_id <= len(donors):
+                last_name, first_name, (street_line, city, zipcode) = donors[donor_id - 1]
+            else:
+                last_name, first_name = _surname(rng), rng.choice(common_first_names)
+                street_line, city, zipcode = _address(rng)
+            writer.writerow([donor_id, last_name, first_name, street_line.lower(), city, "TX", zipcode,
+                             f"979-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+                             f"{first_name.lower()}.{last_name.lower()}@example.com"])
+
+
+def generate_donation_csv(file_path, rows, seed=2025):
+    """
+    Write a donation CSV with the given number of rows.
+
+    About 3% of gifts are anonymous, 10% come from organizations, and the rest
+    come from a donor population where the same donor gives several times.
+    """
+    rng = random.Random(seed + 2)
+    donors = build_donor_population(rows, seed)
+    with open(file_path, mode="w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(required_headers + ["Account"])
+        for _ in range(rows):
+            roll = rng.random()
+            if roll < 0.03:
+                name, address = rng.choice(anonymous_names), ""
+            elif roll < 0.13:
+                name = rng.choice(organization_names)
+                address = _donation_address(rng, _address(rng))
+            else:
+                last_name, first_name, donor_address = rng.choice(donors)
+                if rng.random() < 0.1:
+                    donor_address = _address(rng)  # gift from a new address
+                name = f"{last_name}|{first_name}" if rng.random() < 0.9 else f"{last_name.upper()} | {first_name}"
+                address = _donation_address(rng, donor_address)
+            writer.writerow([name, _date(rng), f"${rng.choice([10, 25, 50, 100, 250, 1000])}.00",
+                             rng.choice(funds), rng.choice(campaigns), rng.choice(appeals),
+                             rng.choice(methods), address, "Operating"])
+
+
+def generate_dataset(output_dir, rows, seed=2025):
+    """
+    Generate (or reuse) the donation and contact CSVs for a row count.
+
+    Returns:
+        tuple: (donation_csv_path, contact_csv_path)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    donation_path = os.path.join(output_dir, f"donations_{rows}_{seed}_RAW.csv")
+    contact_path = os.path.join(output_dir, f"contacts_{rows}_{seed}.csv")
+    if not os.path.exists(donation_path):
+        generate_donation_csv(donation_path, rows, seed)
+    if not os.path.exists(contact_path):
+        generate_contact_csv(contact_path, rows, seed)
+    return donation_path, contact_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic donation and contact CSVs.")
+    parser.add_argument("--rows", default="10k", help="Row count, e.g. 10k, 100k, 1M, 10M.")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--output-dir", default=os.path.join(os.path.dirname(__file__), "data"))
+    args = parser.parse_args()
+    paths = generate_dataset(args.output_dir, parse_size(args.rows), args.seed)
+    print(f"Wrote {paths[0]} and {paths[1]}")
@@ -0,0 +1,72 @@
+import json
+import os
+
+
+class RunCheckpoint:
+    """
+    Progress of a transformation run, persisted as a small JSON file so a run that
+    dies part-way through a large file can continue where it left off.
+
+    A checkpoint records the input file and its fingerprint, how many input rows
+    have been fully processed, and the output file with the size of its partial
+    copy at that point (the ".part" file when the output is written atomically). It is written atomically (temp file + rename), so a crash while saving
+    leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def load(self):
+        """
+        Return the saved checkpoint as a dict, or None if there is none.
+        """
+        if not os.path.exists(self.file_path):
+            return None
+        try:
+            with open(self.file_path, mode="r", encoding="utf-8") as checkpoint_file:
+                return json.load(checkpoint_file)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable checkpoint {self.file_path}: {e}")
+            return None
+
+    def load_matching(self, input_path, input_fingerprint):
+        """
+        Return the saved checkpoint if it belongs to this exact input file and its
+        partial output still exists, otherwise None.
+        """
+        state = self.load()
+        if state is None:
+            return None
+        if state.get("input_fingerprint") != input_fingerprint:
+            print("The input file changed since the checkpoint was saved; starting from the first row.")
+            return None
+        partial_path = state.get("partial_path") or state.get("output_path")
+        if not partial_path or not os.path.exists(partial_path):
+            print("The partial output of the previous run is missing; starting from the first row.")
+            return None
+        if os.path.getsize(partial_path) < state.get("output_bytes", 0):
+            print("The partial output of the previous run is shorter than recorded; starting from the first row.")
+            return None
+        return state
+
+    def save(self, input_path, input_fingerprint, rows_processed, output_path, output_bytes, output_rows,
+             partial_path=None):
+        state = {
+            "input_path": input_path,
+            "input_fingerprint": input_fingerprint,
+            "rows_processed": rows_processed,
+            "output_path": output_path,
+            "partial_path": partial_path or output_path,
+            "output_bytes": output_bytes,
+            "output_rows": output_rows,
+        }
+        temp_path = self.file_path + ".tmp"
+        with open(temp_path, mode="w", encoding="utf-8") as checkpoint_file:
+            json.dump(state, checkpoint_file, indent=2)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, self.file_path)
+
+    def delete(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
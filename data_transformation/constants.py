@@ -1,3 +1,5 @@
+import os
+
 required_headers = ["Name",
                     "Date",
                     "Amount",
@@ -23,6 +25,11 @@ contact_list_headers = ["Donor_ID",
 
 base_csv_directory = 'C:/Users/marcu/Downloads/TAMU_Selfless_Service'
 
+# Where CSVHandler keeps its binary parsed-input caches (see parsed_cache.py).
+parsed_cache_directory = os.path.join(os.path.expanduser("~"), "Downloads", "TAMU_Selfless_Service", "Parsed_Input_Cache")
+# Total size the parsed-input caches may take up; the least recently used ones are removed beyond it.
+parsed_cache_max_bytes = 2 * 1024 * 1024 * 1024
+
 
 output_headers = ["Title",
                   "First Name",
@@ -47,6 +54,75 @@ output_headers = ["Title",
                   "Note"
                   ]
 
+# Names containing any of these are anonymous gifts and are left out of the output.
+anonymous_keywords = ["anonymous", "unknown", "annonomus", "annomous",
+                      "anonumus", "annomunus", "cash donation"]
+
+# Names containing any of these are treated as organizations rather than people.
+organization_keywords = ["church", "fellow", "frat", "fraternity",
+                         "foundation", "llc", "bcs", "club",
+                         "agency", "firm", "plumbing", "bible",
+                         "sales", "baptist", "brazos valley",
+                         "college", "school", "vanguard", "luke bryans",
+                         "kroger", "aggieland", "automotive", "studio",
+                         "inc", "inc.", "charitable", "beginnings",
+                         "class", "chi", "enterprise", "company",
+                         "investment", "offices"]
+
+# Common nicknames mapped to the formal first name, used by fuzzy contact matching.
+first_name_nicknames = {
+    "al": "albert",
+    "alex": "alexander",
+    "andy": "andrew",
+    "barb": "barbara",
+    "ben": "benjamin",
+    "beth": "elizabeth",
+    "betty": "elizabeth",
+    "bill": "william",
+    "billy": "william",
+    "bob": "robert",
+    "bobby": "robert",
+    "cathy": "catherine",
+    "charlie": "charles",
+    "chris": "christopher",
+    "chuck": "charles",
+    "dan": "daniel",
+    "danny": "daniel",
+    "dave": "david",
+    "debbie": "deborah",
+    "don": "donald",
+    "ed": "edward",
+    "eddie": "edward",
+    "jim": "james",
+    "jimmy": "james",
+    "jeff": "jeffrey",
+    "jerry": "gerald",
+    "joe": "joseph",
+    "jon": "john",
+    "johnny": "john",
+    "kathy": "katherine",
+    "ken": "kenneth",
+    "larry": "lawrence",
+    "liz": "elizabeth",
+    "matt": "matthew",
+    "mike": "michael",
+    "nick": "nicholas",
+    "pam": "pamela",
+    "pat": "patricia",
+    "peggy": "margaret",
+    "rick": "richard",
+    "rob": "robert",
+    "ron": "ronald",
+    "sam": "samuel",
+    "steve": "steven",
+    "sue": "susan",
+    "tim": "timothy",
+    "tom": "thomas",
+    "tommy": "thomas",
+    "tony": "anthony",
+    "will": "william",
+}
+
 valid_states = {
     "al": "AL",
     "alabama": "AL",
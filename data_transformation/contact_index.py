@@ -0,0 +1,98 @@
+import sys
+
+from .records import FieldReader
+
+
+# Contact fields returned by a lookup, in the same order as DatabaseConnector.lookup_contact.
+contact_record_headers = ["Address", "City", "State", "Zipcode", "Phone", "Email"]
+
+
+class ContactIndex:
+    """
+    An in-memory hash index of the contact list keyed by (Last_Name, First_Name).
+
+    The index is built once, either from the Donors table or straight from the
+    contact list records, and then answers name lookups at dictionary speed
+    instead of issuing one SQLite query per donation row.
+
+    Keys compare exactly like the `Last_Name = ? AND First_Name = ?` SQL
+    lookup, and every key keeps a match count so the "exactly one match" rule
+    of DatabaseConnector.query_for_match_by_name is preserved. Records are
+    stored as tuples of interned strings to keep memory use compact.
+    """
+
+    def __init__(self):
+        self._records = {}     # (last, first) -> (Address, City, State, Zip, Phone, Email)
+        self._duplicates = {}  # (last, first) -> match count, only for names seen more than once
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, last_name, first_name, record):
+        """
+        Add one contact to the index.
+
+        Args:
+            last_name (str): Donor's last name.
+            first_name (str): Donor's first name.
+            record (tuple): (Address, City, State, Zip, Phone, Email) for the donor.
+        """
+        key = (sys.intern(str(last_name)), sys.intern(str(first_name)))
+        if key in self._records:
+            self._duplicates[key] = self._duplicates.get(key, 1) + 1
+            return
+        self._records[key] = tuple(sys.intern(str(value)) for value in record)
+
+    def lookup(self, last_name, first_name):
+        """
+        Look up a donor by last name and first name.
+
+        Returns:
+            tuple: (match_count, record) where record is
+            (Address, City, State, Zip, Phone, Email) when exactly one donor matches,
+            and None otherwise.
+        """
+        key = (last_name, first_name)
+        record = self._records.get(key)
+        if record is None:
+            return 0, None
+        match_count = self._duplicates.get(key, 1)
+        if match_count == 1:
+            return match_count, record
+        else:
+            return match_count, None
+
+    def unique_items(self):
+        """
+        Yield ((last_name, first_name), record) for every name with exactly one match.
+        """
+        for key, record in self._records.items():
+            if key not in self._duplicates:
+                yield key, record
+
+    @classmethod
+    def from_database(cls, cursor):
+        """
+        Build the index from the Donors table using an open sqlite3 cursor.
+        """
+        index = cls()
+        cursor.execute("SELECT Last_Name, First_Name, Address, City, State, Zip, Phone, Email FROM Donors")
+        for row in cursor:
+            index.add(row[0], row[1], row[2:])
+        return index
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build the index from contact list records (keyed by contact_list_headers),
+        for example CSVHandler.get_records() on the contact CSV.
+
+        Unlike the Donors table, rows with a duplicate Donor_ID are not rejected here.
+        """
+        index = cls()
+        read_names = FieldReader(("Last_Name", "First_Name"))
+        read_record = FieldReader(contact_record_headers)
+        for row in records:
+            last_name, first_name = read_names(row)
+            index.add(last_name, first_name, read_record(row))
+        return index
@@ -1,28 +1,59 @@
 import csv
+import gzip
+import io
+import itertools
 import os
 from datetime import datetime
 from .constants import base_csv_directory
+from .parsed_cache import ParsedCSVCache, ParsedCSVCacheBuilder, file_sha256
+from .records import record_type
 from tkinter import Tk, filedialog
 
+try:
+    import zstandard
+except ImportError:  # zstd output is optional
+    zstandard = None
+
+# Filename extension added for each output compression.
+compression_extensions = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# Bytes buffered by CSVStreamWriter before each write to disk.
+default_write_buffer_size = 1024 * 1024
+
 class MissingHeaderException(Exception):
     def __init__(self, missing_headers):
         self.missing_headers = missing_headers
         super().__init__(f"The provided CSV file is missing the required headers: \n{'  |  '.join(missing_headers)}\n")
 
 class CSVHandler:
-    def __init__(self, file_path=None):
+    def __init__(self, file_path=None, use_cache=False, cache_directory=None):
         """
         Initialize the CSVHandler with an optional filepath
         If no filepath provided, prompt user to select one.
+
+        With use_cache (off by default, as the cache is a second full-size copy of
+        the file), the first full read of a file also stores its parsed columns in a
+        binary cache (see parsed_cache.py), and later reads of the unchanged file are
+        served from that cache instead of being parsed again.
         """
         self.file_path = file_path
         self.data = []
         self.headers = []
+        self.use_cache = use_cache
+        self.cache_directory = cache_directory
 
 
         # Prompt for file if not provided
         if not self.file_path:
             self.file_path = self._prompt_for_file()
+        else:
+            self._set_file_name(self.file_path)
+
+    def _set_file_name(self, file_path):
+        # Output files are named after the input: "2024_RAW.csv" -> "2024_CLEAN".
+        self.file_name = os.path.basename(file_path)  # Save the file name to a variable
+        year = self.file_name[:-8] # excluding "_RAW.csv"
+        self.file_name_suffix = year + "_CLEAN"
 
     def _prompt_for_file(self):
         # Prompt the user to select a CSV file using a file dialog.
@@ -46,9 +77,7 @@ class CSVHandler:
 
         if file_path:
             print(f"Selected file: {file_path}")
-            self.file_name = os.path.basename(file_path)  # Save the file name to a variable
-            year = self.file_name[:-8] # excluding "_RAW.csv"
-            self.file_name_suffix = year + "_CLEAN"
+            self._set_file_name(file_path)
             return file_path
         else:
             raise FileNotFoundError("No CSV file was selected. The program will now close.")
@@ -65,16 +94,137 @@ class CSVHandler:
             return
 
         try:
-            with open(self.file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-                reader = csv.DictReader(csvfile)
-                self.headers = reader.fieldnames  # Populate the headers attribute
-                self.data = [row for row in reader]
-                print(f"Loaded {len(self.data)} records from {self.file_path}")
+            self.data = list(self.iter_records())
+            print(f"Loaded {len(self.data)} records from {self.file_path}")
         except FileNotFoundError:
             print("Error: The file was not found.")
         except Exception as e:
             print(f"An unexpected error occurred while reading CSV: {e}")
 
+    def iter_records(self, start_row=0):
+        """
+        Yield the CSV records one at a time instead of loading them into memory.
+
+        Records are compact row objects (see records.py) that can be read like the
+        dicts of csv.DictReader. The headers attribute is populated as soon as iteration starts. Errors are
+        raised to the caller rather than printed, so a failure part-way through a
+        file can never be mistaken for the end of the file.
+
+        start_row skips that many records first (e.g. when resuming a run) without
+        building a dict for each of them.
+        """
+        if not self.file_path:
+            print("No file path provided.")
+            return
+
+        cache = self._open_cache()
+        if cache is not None:
+            with cache:
+                self.headers = cache.headers
+                yield from cache.iter_records(start_row)
+            return
+
+        with open(self.file_path, mode="r", newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            self.headers = next(reader, None)  # Populate the headers attribute
+            if self.headers is None or not self._skip_rows(reader, start_row):
+                return
+            Record = record_type(self.headers)
+            builder = self._start_cache(start_row)
+            if builder is None:
+                for row in reader:
+                    if row:  # Like csv.DictReader, skip blank lines
+                        yield Record(*row)
+                return
+            width = len(self.headers)
+            try:
+                for row in reader:
+                    if not row:
+                        continue
+                    builder.add_row(row if len(row) >= width else row + [None] * (width - len(row)))
+                    yield Record(*row)
+                builder.finish()
+            finally:
+                builder.abandon()  # No-op once finished; drops the cache of a partial read
+
+    def _open_cache(self):
+        # The parsed-input cache of this file, or None if caching is off or the cache is stale.
+        if not self.use_cache:
+            return None
+        return ParsedCSVCache.open(self.file_path, self.cache_directory)
+
+    def _start_cache(self, start_row):
+        # A builder for the parsed-input cache, only when the whole file is about to be read.
+        if not self.use_cache or start_row or not self.headers:
+            return None
+        try:
+            return ParsedCSVCacheBuilder(self.file_path, self.headers, self.cache_directory)
+        except OSError:
+            return None  # Caching is an optimization; an unwritable cache directory is not an error
+
+    @staticmethod
+    def _skip_rows(reader, count):
+        # Skip count non-blank rows of a csv.reader (DictReader ignores blank rows too).
+        # Returns False if the file ended first.
+        skipped = 0
+        while skipped < count:
+            row = next(reader, None)
+            if row is None:
+                return False
+            if row:
+                skipped += 1
+        return True
+
+    def iter_column_batches(self, batch_size=100000, start_row=0):
+        """
+        Yield the CSV in batches of up to batch_size rows, each batch a dict of
+        header -> list of column values.
+
+        Rows are read with csv.reader and transposed, so no per-row dict is ever
+        built. Like csv.DictReader, blank lines are skipped and missing trailing
+        values are None. start_row skips that many records first.
+        """
+        if not self.file_path:
+            print("No file path provided.")
+            return
+
+        cache = self._open_cache()
+        if cache is not None:
+            with cache:
+                self.headers = cache.headers
+                yield from cache.iter_column_batches(batch_size, start_row)
+            return
+
+        with open(self.file_path, mode="r", newline="", encoding="utf-8") as csvfile:
+            reader = csv.reader(csvfile)
+            self.headers = next(reader, [])
+            width = len(self.headers)
+            if not self._skip_rows(reader, start_row):
+                return
+            builder = self._start_cache(start_row)
+            records = filter(None, reader)  # Blank lines do not count towards a batch
+            try:
+                while True:
+                    rows = list(itertools.islice(records, batch_size))
+                    if not rows:
+                        break
+                    rows = [row if len(row) >= width else row + [None] * (width - len(row)) for row in rows]
+                    if builder is not None:
+                        builder.add_rows(rows)
+                    yield {header: list(column) for header, column in zip(self.headers, zip(*rows))}
+                if builder is not None:
+                    builder.finish()
+            finally:
+                if builder is not None:
+                    builder.abandon()
+
+    def fingerprint(self, chunk_size=1024 * 1024):
+        """
+        Return a SHA-256 hex digest of the file contents, read in chunks so large
+        files never have to fit in memory. Identical files give identical fingerprints.
+        """
+        return file_sha256(self.file_path, chunk_size)
+
     def get_records(self):
         # Return all records from CSV file.
         return self.data
@@ -123,26 +273,172 @@ class CSVWriter:
             os.makedirs(self.output_directory)
             print(f"Created directory: {self.output_directory}")
 
-    def write_csv(self, rows, filename_suffix="output"):
+    def _build_filename(self, filename_suffix, extension=".csv", attempt=0):
+        # Create a timestamped filename (e.g. "2025-03-22__02_15 pm"); later attempts
+        # within the same minute get a counter ("..._02_15 pm_2") instead of clobbering.
+        timestamp = datetime.now().strftime("%Y-%m-%d__%I_%M %p").lower()
+        counter = f"_{attempt + 1}" if attempt else ""
+        return os.path.join(self.output_directory, f"{filename_suffix}_{timestamp}{counter}{extension}")
+
+    def output_path(self, filename_suffix, extension=".csv"):
+        """
+        Return a timestamped path in the output directory that does not exist yet.
+        """
+        for attempt in itertools.count():
+            filename = self._build_filename(filename_suffix, extension, attempt)
+            if not os.path.exists(filename):
+                return filename
+
+    def open_stream(self, filename_suffix="output", compression=None, atomic=False,
+                    buffer_size=default_write_buffer_size, keep_partial=False):
+        """
+        Open a timestamped CSV file for writing rows one at a time.
+
+        :param filename_suffix: A short string to include in the CSV filename.
+        :param compression: None, "gzip" (.csv.gz) or "zstd" (.csv.zst, needs the zstandard package).
+        :param atomic: Write to a ".part" file that is renamed to the final name only once
+                       the stream is closed successfully, so no one ever sees a partial CSV.
+        :param buffer_size: Bytes buffered before each write to disk.
+        :param keep_partial: In atomic mode, keep the ".part" file if writing fails.
+        :return: A CSVStreamWriter. Use it as a context manager, or call close() when done.
+        """
+        extension = ".csv" + compression_extensions.get(compression, "")
+        for attempt in itertools.count():
+            filename = self._build_filename(filename_suffix, extension, attempt)
+            if os.path.exists(filename):
+                continue
+            try:
+                return CSVStreamWriter(filename, compression=compression, atomic=atomic,
+                                       buffer_size=buffer_size, keep_partial=keep_partial)
+            except FileExistsError:
+                continue  # Another run claimed this name first
+
+    def resume_stream(self, filename, resume_offset, atomic=False):
+        """
+        Reopen a partially written CSV to continue it, first cutting it back to
+        resume_offset bytes (the size recorded at the last checkpoint). With atomic,
+        filename is the final name and the ".part" file is the one continued.
+        """
+        return CSVStreamWriter(filename, resume_offset=resume_offset, atomic=atomic, keep_partial=True)
+
+    def write_csv(self, rows, filename_suffix="output", compression=None):
         """
         Writes the provided rows of data to a CSV file, with a timestamped filename.
 
-        :param rows: A list of lists. Each inner list represents one row for the CSV.
+        :param rows: An iterable of lists. Each inner list represents one row for the CSV.
                      Example: [["Header1", "Header2"], ["Value1", "Value2"], ...]
         :param filename_suffix: A short string to include in the CSV filename.
+        :param compression: None, "gzip" or "zstd" (see open_stream).
         """
         try:
-            # Create a timestamped filename (e.g. "2025-03-22__02_15 pm")
-            timestamp = datetime.now().strftime("%Y-%m-%d__%I_%M %p").lower()
-            filename = os.path.join(self.output_directory, f"{filename_suffix}_{timestamp}.csv")
-
-            # Write the data to a CSV file
-            with open(filename, mode="w", newline="", encoding="utf-8") as file:
-                writer = csv.writer(file)
-                for row in rows:
-                    writer.writerow(row)
-
-            print(f"CSV successfully written to: {filename}")
+            with self.open_stream(filename_suffix, compression=compression, atomic=True) as output_stream:
+                output_stream.write_rows(rows)
 
         except Exception as e:
             print(f"Failed to write CSV. Error: {str(e)}")
+
+
+class CSVStreamWriter:
+    """
+    Writes rows to a CSV file as they are produced, so the output never has to be
+    held in memory as a list of lists. Returned by CSVWriter.open_stream.
+
+    Output goes through a large write buffer and can be gzip or zstd compressed. In
+    atomic mode rows are written to "<filename>.part", which is renamed to filename
+    by close(); if writing fails the ".part" file is removed, unless keep_partial is
+    set (e.g. so a checkpointed run can be resumed).
+    """
+
+    def __init__(self, filename, resume_offset=None, compression=None, atomic=False,
+                 buffer_size=default_write_buffer_size, keep_partial=False):
+        if compression not in compression_extensions:
+            raise ValueError(f"Unknown compression '{compression}'. "
+                             f"Expected one of: {', '.join(str(option) for option in compression_extensions)}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+        if compression is not None and resume_offset is not None:
+            raise ValueError("Compressed output cannot be resumed")
+        self.filename = filename
+        self.path = filename + ".part" if atomic else filename  # The file actually being written
+        self.atomic = atomic
+        self.keep_partial = keep_partial
+        self.rows_written = 0
+
+        if resume_offset is None:
+            self._raw = open(self.path, mode="xb" if atomic else "wb", buffering=0)
+        else:
+            # Drop anything written after the last checkpoint, then append.
+            self._raw = open(self.path, mode="r+b", buffering=0)
+            self._raw.truncate(resume_offset)
+            self._raw.seek(resume_offset)
+
+        if compression == "gzip":
+            self._compressor = gzip.GzipFile(filename=os.path.basename(filename), mode="wb", fileobj=self._raw)
+        elif compression == "zstd":
+            self._compressor = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._compressor = None
+        self._buffer = io.BufferedWriter(self._compressor or self._raw, buffer_size=buffer_size)
+        self._file = io.TextIOWrapper(self._buffer, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_files()
+            if self.atomic and not self.keep_partial and os.path.exists(self.path):
+                os.remove(self.path)
+            print(f"Failed to write CSV {self.filename}. Error: {exc_value}")
+
+    def write_row(self, row):
+        # Write a single row (a list of values) to the CSV file.
+        self._writer.writerow(row)
+        self.rows_written += 1
+
+    def write_rows(self, rows, batch_size=1000):
+        # Write every row from an iterable of rows, handing them to writerows in batches.
+        if isinstance(rows, (list, tuple)):
+            self._writer.writerows(rows)
+            self.rows_written += len(rows)
+            return
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                return
+            self._writer.writerows(batch)
+            self.rows_written += len(batch)
+
+    def flush(self):
+        """
+        Force everything written so far onto disk and return the file size in bytes.
+        """
+        self._file.flush()
+        if self._compressor is not None:
+            self._compressor.flush()
+        os.fsync(self._raw.fileno())
+        return os.fstat(self._raw.fileno()).st_size
+
+    def _close_files(self):
+        try:
+            self._file.close()  # Also flushes and closes the buffer and compressor
+        finally:
+            self._raw.close()
+
+    def close(self):
+        if self._raw.closed:
+            return
+        self._file.flush()
+        if self._compressor is not None:
+            self._file.close()
+        if self.atomic:
+            os.fsync(self._raw.fileno())
+        self._close_files()
+        if self.atomic:
+            os.replace(self.path, self.filename)
+        print(f"CSV successfully written to: {self.filename}")
+
@@ -5,18 +5,99 @@ Created on Wed Apr  2 19:50:19 2025
 @author: marcu
 """
 
+import logging
 import sqlite3
 import re
+import os
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+from .constants import valid_states, contact_list_headers
+from .contact_index import ContactIndex
+from .fuzzy_matching import FuzzyContactIndex
+from .records import FieldReader
+
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseConfig:
+    """
+    How DatabaseConnector opens its SQLite database.
+
+    path is the database file (relative to the working directory) or ":memory:"
+    for a private in-memory database that disappears when the connection closes.
+    journal_mode, synchronous, cache_size (pages, or KiB when negative, as in
+    PRAGMA cache_size) and mmap_size (bytes) are applied as pragmas on every
+    connection. WAL lets several processes read the file while one writes, e.g.
+    the workers of a batch run. cached_statements is the number of prepared
+    statements the connection keeps for reuse by the per-row queries.
+    """
+
+    journal_modes = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+    synchronous_levels = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+    def __init__(self, path="contact_info.db", journal_mode="WAL", synchronous="NORMAL", cache_size=-65536,
+                 mmap_size=256 * 1024 * 1024, cached_statements=256, timeout=30.0):
+        journal_mode = journal_mode.upper()
+        synchronous = synchronous.upper()
+        # Pragma values cannot be bound as parameters, so only known values are accepted.
+        if journal_mode not in self.journal_modes:
+            raise ValueError(f"Unknown journal_mode '{journal_mode}'. Expected one of: {', '.join(self.journal_modes)}")
+        if synchronous not in self.synchronous_levels:
+            raise ValueError(f"Unknown synchronous level '{synchronous}'. "
+                             f"Expected one of: {', '.join(self.synchronous_levels)}")
+        self.path = path
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = int(cache_size)
+        self.mmap_size = int(mmap_size)
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+
+    @property
+    def in_memory(self):
+        return self.path == ":memory:"
+
+    def __repr__(self):
+        return (f"DatabaseConfig(path={self.path!r}, journal_mode={self.journal_mode!r}, "
+                f"synchronous={self.synchronous!r}, cache_size={self.cache_size}, mmap_size={self.mmap_size})")
 
 
-from .constants import valid_states
-
 class DatabaseConnector:
-    def __init__(self, file_path=None):
+    backends = ("sqlite", "memory")
+
+    def __init__(self, file_path=None, backend="sqlite", fuzzy_threshold=None, config=None):
         """
-        Initialize the ExcelFormatter by leveraging PulledFilesExcelHandler
-        to manage the Excel file interactions.
+        Open the contact database.
+
+        config is a DatabaseConfig (path, pragmas); by default contact_info.db in the
+        working directory with WAL journaling. file_path, if given, overrides its path.
+        Use the connector as a context manager to have it optimized and closed on exit.
+
+        backend selects how lookup_contact answers name lookups:
+          "sqlite" - one indexed query per lookup against the Donors table.
+          "memory" - a ContactIndex built once from the Donors table on first lookup.
+
+        fuzzy_threshold, when set (0 < threshold <= 1), lets match_contact fall back to
+        a FuzzyContactIndex for names with no exact match in the Donors table.
         """
+        if backend not in self.backends:
+            raise ValueError(f"Unknown backend '{backend}'. Expected one of: {', '.join(self.backends)}")
+        if fuzzy_threshold is not None and not 0.0 < fuzzy_threshold <= 1.0:
+            raise ValueError("fuzzy_threshold must be in (0, 1]")
+        if config is None:
+            config = DatabaseConfig()
+        if file_path is not None:
+            config.path = file_path
+        self.config = config
+        self.backend = backend
+        self.contact_index = None
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_index = None
+
         # Initialize database
         self.conn = None
         self.cursor = None
@@ -31,24 +112,37 @@ class DatabaseConnector:
 
     def __exit__(self, exc_type, exc_value, traceback):
         """
-        Exit the runtime context, handling any necessary cleanup.
+        Exit the runtime context: optimize and close the connection.
         """
-        # Add any cleanup logic here if needed
-        print("Exiting DatabaseConnector context.")
+        self.close_connection()
 
     def initialize_database(self):
-        # Connect to (or create) a SQLite database file
-        self.conn = sqlite3.connect("contact_info.db")
+        # Connect to (or create) the configured database; an open connection is closed first.
+        # The connection may be used from pipeline threads (see AddressParser's
+        # persistent_cache), which serialize their access.
+        if self.conn is not None:
+            self.close_connection()
+        config = self.config
+        self.conn = sqlite3.connect(config.path, timeout=config.timeout, check_same_thread=False,
+                                    cached_statements=config.cached_statements)
         self.cursor = self.conn.cursor()
+        self.cursor.execute(f"PRAGMA journal_mode={config.journal_mode}")
+        self.cursor.execute(f"PRAGMA synchronous={config.synchronous}")
+        self.cursor.execute(f"PRAGMA cache_size={config.cache_size}")
+        if not config.in_memory:
+            self.cursor.execute(f"PRAGMA mmap_size={config.mmap_size}")
 
     def check_and_drop_table(self):
         """Check if the Users table exists and drop it if it does."""
         self.cursor.execute("DROP TABLE IF EXISTS Donors")
+        self._clear_contact_fingerprint()
         self.conn.commit()  # Commit the drop operation
+        self._invalidate_indexes()
 
-    def create_table(self):
-        self.cursor.execute("""
-            CREATE TABLE Donors (
+    def create_table(self, if_not_exists=False):
+        # if_not_exists keeps an existing Donors table (used by sync_contact_list).
+        self.cursor.execute(f"""
+            CREATE TABLE {"IF NOT EXISTS " if if_not_exists else ""}Donors (
                 Donor_ID INT PRIMARY KEY,
                 Last_Name TEXT NOT NULL,
                 First_Name TEXT NOT NULL,
@@ -60,10 +154,29 @@ class DatabaseConnector:
                 Email NOT NULL
             )
         """)
+        # Composite index so name lookups are a B-tree search instead of a full table scan.
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_donors_name ON Donors (Last_Name, First_Name)")
+        # Remembers the fingerprint of the last contact file applied by sync_contact_list.
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Sync_State (
+                Name TEXT PRIMARY KEY,
+                Value TEXT NOT NULL
+            )
+        """)
         self.conn.commit()  # Commit changes to make sure the table is created
 
     def close_connection(self):
-        self.conn.close()  # Close the database connection properly
+        # Let SQLite refresh its query planner statistics, then close the connection properly.
+        if self.conn is None:
+            return
+        try:
+            self.conn.commit()
+            self.cursor.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            logger.info("PRAGMA optimize failed: %s", e)
+        self.conn.close()
+        self.conn = None
+        self.cursor = None
 
     def insert_record(self, csv_Donor_ID, csv_Last_Name, csv_First_Name, csv_Address, csv_City, csv_State, csv_Zip, csv_Phone, csv_Email):
         """
@@ -72,7 +185,8 @@ class DatabaseConnector:
            This method executes an SQL INSERT statement to add a new record with the provided donor details.
            It commits the transaction to save changes to the database. If the insertion fails due to a
            UNIQUE constraint (for example, when a duplicate Donor_ID is encountered), the method catches
-           the sqlite3.IntegrityError and prints an error message.
+           the sqlite3.IntegrityError and logs it at INFO level (use bulk_insert_records
+           for a single summary of all duplicates).
 
            Args:
                csv_Donor_ID (str or int): Unique identifier for the donor.
@@ -95,9 +209,334 @@ class DatabaseConnector:
             """, (csv_Donor_ID, csv_Last_Name, csv_First_Name, csv_Address, csv_City, csv_State, csv_Zip, csv_Phone, csv_Email))
 
             self.conn.commit()
+            self._invalidate_indexes()
 
         except sqlite3.IntegrityError as e:
-            print(f"❌ ERROR: UNIQUE constraint failed! Duplicate Donor_ID: {csv_Donor_ID}")
+            logger.info("UNIQUE constraint failed! Duplicate Donor_ID: %s", csv_Donor_ID)
+
+    def bulk_insert_records(self, records, batch_size=5000, journal_mode=None, synchronous=None):
+        """
+           Insert many donor records into the Donors table inside a single transaction.
+
+           Rows are streamed from ``records`` (any iterable of dicts keyed by
+           ``contact_list_headers``, e.g. ``CSVHandler.get_records()``) and written with
+           ``executemany`` in batches of ``batch_size``. Only one commit is issued for the
+           whole load. If a batch hits a UNIQUE constraint, that batch is rolled back to its
+           savepoint and retried row by row so the duplicate Donor_IDs can be collected and
+           reported once at the end instead of printing one message per failure.
+
+           Args:
+               records (iterable of dict or CompactRecord): Contact rows keyed by contact_list_headers.
+               batch_size (int): Number of rows handed to each executemany call.
+               journal_mode (str or None): PRAGMA journal_mode used during the load,
+                   restored afterwards. None (the default) keeps the connection's
+                   DatabaseConfig setting. "MEMORY" or "OFF" load faster, but a crash
+                   during the load can then corrupt the whole database, including the
+                   Donation_Ledger and Address_Cache tables, so only opt in for a
+                   throwaway database.
+               synchronous (str or None): PRAGMA synchronous used during the load,
+                   restored afterwards. None (the default) keeps the connection's setting;
+                   "OFF" has the same crash risk as above.
+
+           Returns:
+               tuple: (number of inserted rows, list of duplicate Donor_IDs)
+           """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        insert_sql = """
+            INSERT INTO Donors (Donor_ID, Last_Name, First_Name, Address, City, State, Zip, Phone, Email)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+
+        if journal_mode is not None and journal_mode.upper() not in DatabaseConfig.journal_modes:
+            raise ValueError(f"Unknown journal_mode '{journal_mode}'")
+        if synchronous is not None and synchronous.upper() not in DatabaseConfig.synchronous_levels:
+            raise ValueError(f"Unknown synchronous level '{synchronous}'")
+
+        # Any pending work must be committed before the pragmas can be changed.
+        self.conn.commit()
+        previous_journal_mode = self.cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        previous_synchronous = self.cursor.execute("PRAGMA synchronous").fetchone()[0]
+        if journal_mode is not None:
+            self.cursor.execute(f"PRAGMA journal_mode={journal_mode.upper()}")
+        if synchronous is not None:
+            self.cursor.execute(f"PRAGMA synchronous={synchronous.upper()}")
+
+        inserted = 0
+        duplicate_ids = []
+        self._invalidate_indexes()
+        read_values = FieldReader(contact_list_headers)
+
+        def flush(batch):
+            nonlocal inserted
+            self.cursor.execute("SAVEPOINT bulk_batch")
+            try:
+                self.cursor.executemany(insert_sql, batch)
+                inserted += len(batch)
+            except sqlite3.IntegrityError:
+                # Undo the partial batch and find the offending rows one at a time.
+                self.cursor.execute("ROLLBACK TO bulk_batch")
+                for values in batch:
+                    try:
+                        self.cursor.execute(insert_sql, values)
+                        inserted += 1
+                    except sqlite3.IntegrityError:
+                        duplicate_ids.append(values[0])
+            self.cursor.execute("RELEASE bulk_batch")
+
+        try:
+            self.cursor.execute("BEGIN")
+            self._clear_contact_fingerprint()
+            batch = []
+            for row in records:
+                batch.append(read_values(row))
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            if journal_mode is not None:
+                self.cursor.execute(f"PRAGMA journal_mode={previous_journal_mode}")
+            if synchronous is not None:
+                self.cursor.execute(f"PRAGMA synchronous={previous_synchronous}")
+
+        print(f"Inserted {inserted} contact records into the Donors table.")
+        if duplicate_ids:
+            print(f"❌ ERROR: UNIQUE constraint failed for {len(duplicate_ids)} rows! "
+                  f"Duplicate Donor_IDs: {', '.join(str(donor_id) for donor_id in duplicate_ids)}")
+
+        return inserted, duplicate_ids
+
+    def sync_contact_list(self, records, fingerprint, batch_size=5000):
+        """
+           Bring the Donors table in line with a contact list without reloading it from scratch.
+
+           The fingerprint of the last contact file applied is stored in the Sync_State table.
+           When the new fingerprint matches, nothing is read or written. Otherwise the records
+           are compared with the current table by Donor_ID and only the differences are applied
+           in a single transaction: new and changed donors are upserted and donors missing from
+           the file are deleted. As with a full reload, only the first row for a Donor_ID is
+           kept and the duplicates are reported once.
+
+           Args:
+               records (iterable of dict or CompactRecord): Contact rows keyed by contact_list_headers.
+               fingerprint (str): Content fingerprint of the contact file (CSVHandler.fingerprint()).
+               batch_size (int): Number of rows handed to each executemany call.
+
+           Returns:
+               dict: Counts of "inserted", "updated", "deleted" and "unchanged" donors,
+               "skipped" (True when the fingerprint matched) and the "duplicate_ids" list.
+           """
+        self.create_table(if_not_exists=True)
+        summary = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0,
+                   "skipped": False, "duplicate_ids": []}
+
+        if self._get_contact_fingerprint() == fingerprint:
+            summary["skipped"] = True
+            print("Contact list unchanged since the last load; skipping the Donors reload.")
+            return summary
+
+        upsert_sql = """
+            INSERT INTO Donors (Donor_ID, Last_Name, First_Name, Address, City, State, Zip, Phone, Email)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(Donor_ID) DO UPDATE SET
+                Last_Name = excluded.Last_Name, First_Name = excluded.First_Name,
+                Address = excluded.Address, City = excluded.City, State = excluded.State,
+                Zip = excluded.Zip, Phone = excluded.Phone, Email = excluded.Email
+            """
+
+        # Current table contents keyed the same way as the incoming rows.
+        existing = {}
+        self.cursor.execute("SELECT Donor_ID, Last_Name, First_Name, Address, City, State, Zip, Phone, Email FROM Donors")
+        for row in self.cursor.fetchall():
+            existing[self._donor_id_key(row[0])] = tuple(str(value) for value in row[1:])
+
+        seen_ids = set()
+        read_values = FieldReader(contact_list_headers)
+        try:
+            batch = []
+            for row in records:
+                values = read_values(row)
+                donor_id = self._donor_id_key(values[0])
+                if donor_id in seen_ids:
+                    summary["duplicate_ids"].append(values[0])
+                    continue
+                seen_ids.add(donor_id)
+
+                current = existing.get(donor_id)
+                if current is None:
+                    summary["inserted"] += 1
+                elif current != tuple(str(value) for value in values[1:]):
+                    summary["updated"] += 1
+                else:
+                    summary["unchanged"] += 1
+                    continue
+
+                batch.append(values)
+                if len(batch) >= batch_size:
+                    self.cursor.executemany(upsert_sql, batch)
+                    batch = []
+            if batch:
+                self.cursor.executemany(upsert_sql, batch)
+
+            deleted_ids = [(donor_id,) for donor_id in existing if donor_id not in seen_ids]
+            self.cursor.executemany("DELETE FROM Donors WHERE Donor_ID = ?", deleted_ids)
+            summary["deleted"] = len(deleted_ids)
+
+            self._set_contact_fingerprint(fingerprint)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        if summary["inserted"] or summary["updated"] or summary["deleted"]:
+            self._invalidate_indexes()
+
+        print(f"Synced contact list: {summary['inserted']} inserted, {summary['updated']} updated, "
+              f"{summary['deleted']} deleted, {summary['unchanged']} unchanged.")
+        if summary["duplicate_ids"]:
+            print(f"❌ ERROR: UNIQUE constraint failed for {len(summary['duplicate_ids'])} rows! "
+                  f"Duplicate Donor_IDs: {', '.join(str(donor_id) for donor_id in summary['duplicate_ids'])}")
+
+        return summary
+
+    @staticmethod
+    def _donor_id_key(donor_id):
+        # Donor_ID has INT affinity, so "0012" and "12" are stored as the same integer.
+        try:
+            return str(int(str(donor_id).strip()))
+        except ValueError:
+            return str(donor_id)
+
+    def _get_contact_fingerprint(self):
+        try:
+            self.cursor.execute("SELECT Value FROM Sync_State WHERE Name = 'contact_list_fingerprint'")
+        except sqlite3.OperationalError:
+            return None  # Sync_State has not been created yet
+        result = self.cursor.fetchone()
+        return result[0] if result else None
+
+    def _set_contact_fingerprint(self, fingerprint):
+        self.cursor.execute("""
+            INSERT INTO Sync_State (Name, Value) VALUES ('contact_list_fingerprint', ?)
+            ON CONFLICT(Name) DO UPDATE SET Value = excluded.Value
+            """, (fingerprint,))
+
+    def _clear_contact_fingerprint(self):
+        # Any load outside sync_contact_list makes the stored fingerprint meaningless.
+        self.cursor.execute("CREATE TABLE IF NOT EXISTS Sync_State (Name TEXT PRIMARY KEY, Value TEXT NOT NULL)")
+        self.cursor.execute("DELETE FROM Sync_State WHERE Name = 'contact_list_fingerprint'")
+
+    def create_ledger_table(self):
+        # One row per donation already written to a CLEAN file (see donation_ledger.py).
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Donation_Ledger (
+                Fingerprint BLOB PRIMARY KEY,
+                Source_File TEXT NOT NULL,
+                Processed_At TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def get_ledger_fingerprints(self):
+        """
+        Return the set of donation fingerprints recorded in the Donation_Ledger table.
+        """
+        self.create_ledger_table()
+        self.cursor.execute("SELECT Fingerprint FROM Donation_Ledger")
+        return {bytes(row[0]) for row in self.cursor}
+
+    def record_processed_donations(self, fingerprints, source_file, batch_size=5000):
+        """
+        Add donation fingerprints to the Donation_Ledger table in a single transaction.
+        Fingerprints that are already recorded are ignored.
+
+        Returns:
+            int: Number of fingerprints added.
+        """
+        self.create_ledger_table()
+        insert_sql = "INSERT OR IGNORE INTO Donation_Ledger (Fingerprint, Source_File) VALUES (?, ?)"
+        added = 0
+        try:
+            batch = []
+            for fingerprint in fingerprints:
+                batch.append((fingerprint, source_file))
+                if len(batch) >= batch_size:
+                    self.cursor.executemany(insert_sql, batch)
+                    added += self.cursor.rowcount
+                    batch = []
+            if batch:
+                self.cursor.executemany(insert_sql, batch)
+                added += self.cursor.rowcount
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return added
+
+    def create_address_cache_table(self):
+        # Normalized form of every raw address parsed so far, per AddressParser.parser_version.
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Address_Cache (
+                Raw_Address TEXT NOT NULL,
+                Parser_Version INTEGER NOT NULL,
+                Normalized TEXT NOT NULL,
+                PRIMARY KEY (Raw_Address, Parser_Version)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def prune_address_cache(self, parser_version):
+        """
+        Delete Address_Cache entries made by other parser versions; they can never be
+        looked up again. Returns the number of entries deleted.
+        """
+        self.create_address_cache_table()
+        self.cursor.execute("DELETE FROM Address_Cache WHERE Parser_Version != ?", (parser_version,))
+        deleted = self.cursor.rowcount
+        self.conn.commit()
+        return deleted
+
+    def get_cached_addresses(self, raw_addresses, parser_version, batch_size=500):
+        """
+        Look up raw addresses in the Address_Cache table, batch_size at a time.
+
+        Returns:
+            dict: raw address -> normalized address, for the addresses that were found.
+        """
+        raw_addresses = list(raw_addresses)
+        found = {}
+        for start in range(0, len(raw_addresses), batch_size):
+            batch = raw_addresses[start:start + batch_size]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self.conn.execute(f"""
+                SELECT Raw_Address, Normalized FROM Address_Cache
+                WHERE Parser_Version = ? AND Raw_Address IN ({placeholders})
+                """, (parser_version, *batch))
+            found.update(rows)
+        return found
+
+    def cache_addresses(self, normalized_addresses, parser_version):
+        """
+        Store raw address -> normalized address pairs in the Address_Cache table in a
+        single transaction.
+        """
+        if not normalized_addresses:
+            return
+        try:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO Address_Cache (Raw_Address, Parser_Version, Normalized) VALUES (?, ?, ?)",
+                ((raw, parser_version, normalized) for raw, normalized in normalized_addresses.items()))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
 
     # Quick check if the database has this Donor.
     def query_for_match_by_name(self, csv_last_name, csv_first_name):
@@ -123,6 +562,87 @@ class DatabaseConnector:
         else:
             return False
 
+    def lookup_contact(self, csv_last_name, csv_first_name):
+        """
+        Look up a donor by last name and first name in a single indexed query.
+
+        This combines query_for_match_by_name and the query_for_* methods: one
+        SELECT returns both the number of matching donors and the contact fields,
+        using the (Last_Name, First_Name) index built by create_table.
+
+        Args:
+            csv_last_name (str): The last name to search for in the Donors table.
+            csv_first_name (str): The first name to search for in the Donors table.
+
+        Returns:
+            tuple: (match_count, record) where record is
+            (Address, City, State, Zip, Phone, Email) when exactly one donor matches,
+            and None otherwise.
+        """
+        if self.backend == "memory":
+            return self.get_contact_index().lookup(csv_last_name, csv_first_name)
+
+        self.cursor.execute("""
+            SELECT COUNT(*), Address, City, State, Zip, Phone, Email
+            FROM Donors WHERE Last_Name = ? AND First_Name = ?
+            """, (csv_last_name, csv_first_name))
+        result = self.cursor.fetchone()
+        match_count = result[0]
+        if match_count == 1:
+            return match_count, result[1:]
+        else:
+            return match_count, None
+
+    def get_contact_index(self):
+        """
+        Return the in-memory ContactIndex of the Donors table, building it on first use.
+
+        The index is discarded whenever the Donors table is dropped or written to,
+        so it is rebuilt from the current table contents on the next call.
+        """
+        if self.contact_index is None:
+            self.contact_index = ContactIndex.from_database(self.conn.cursor())
+            print(f"Built in-memory contact index with {len(self.contact_index)} names.")
+        return self.contact_index
+
+    def get_fuzzy_index(self):
+        """
+        Return the FuzzyContactIndex of the Donors table, building it on first use.
+        Like the contact index, it is discarded whenever the Donors table changes.
+        """
+        if self.fuzzy_index is None:
+            self.fuzzy_index = FuzzyContactIndex.from_contact_index(self.get_contact_index(), self.fuzzy_threshold)
+        return self.fuzzy_index
+
+    def match_contact(self, csv_last_name, csv_first_name):
+        """
+        Find the contact record for a donor, falling back to fuzzy matching.
+
+        An exact, unique match (lookup_contact) has confidence 1.0. When there is no
+        exact match at all and fuzzy matching is enabled (fuzzy_threshold), the
+        closest contact from the name's phonetic block is used if its similarity
+        reaches the threshold. Names with several exact matches stay unmatched.
+
+        Returns:
+            tuple: (record, confidence) where record is
+            (Address, City, State, Zip, Phone, Email), or (None, 0.0) when nothing matches.
+        """
+        match_count, record = self.lookup_contact(csv_last_name, csv_first_name)
+        if record is not None:
+            return record, 1.0
+        if match_count or self.fuzzy_threshold is None:
+            return None, 0.0
+
+        record, confidence = self.get_fuzzy_index().match(csv_last_name, csv_first_name)
+        if record is None:
+            return None, 0.0
+        return record, confidence
+
+    def _invalidate_indexes(self):
+        # The Donors table changed; in-memory indexes are rebuilt on next use.
+        self.contact_index = None
+        self.fuzzy_index = None
+
     def query_for_address(self, csv_last_name, csv_first_name):
         self.cursor.execute("SELECT Address FROM Donors WHERE Last_Name = ? AND First_Name = ?",
                             (csv_last_name, csv_first_name))
@@ -171,16 +691,172 @@ class DatabaseConnector:
 
 
 class AddressParser:
-    def __init__(self, file_path=None):
+    # Every pattern is compiled once when the class is defined instead of on each call.
+    _number_street_pattern = re.compile(r'^(\d+)([A-Za-z].*)$')
+    _city_zipcode_pattern = re.compile(r'^([A-Za-z]+)(\d+)$')
+    _college_station_pattern = re.compile(r'(?i)\bcollege\s+station\b')
+    _zipcode_pattern = re.compile(r'\b(\d{5})\b\s*$')
+    _token_split_pattern = re.compile(r'[|\s]+')
+    _merged_college_station_pattern = re.compile(r'(?i)collegestation')
+    _street_pattern = re.compile(r'(?i)Street')
+    _drive_pattern = re.compile(r'(?i)Dr\.')
+    _circle_pattern = re.compile(r'(?i)Circle')
+
+    # Bump whenever a change to _transform_address changes its output, so results in
+    # the persistent Address_Cache from older versions are no longer used.
+    parser_version = 1
+
+    def __init__(self, file_path=None, cache_size=65536, persistent_cache=None):
+        """
+        cache_size bounds the LRU cache of parsed addresses, keyed on the raw address
+        string, so an address that recurs across many gifts is only parsed once.
+        Use cache_size=0 to disable the cache and None for an unbounded cache.
+
+        persistent_cache, a DatabaseConnector, makes transform_many look addresses up
+        in its Address_Cache table first and store the ones it had to parse, so
+        addresses seen in earlier runs are not parsed again.
+        """
         self.file_path = file_path
+        self.cache_size = cache_size
+        if cache_size == 0:
+            self._cached_transform = None
+        else:
+            self._cached_transform = functools.lru_cache(maxsize=cache_size)(self._transform_address)
+        self.persistent_cache = persistent_cache
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+        self._persistent_lock = threading.Lock()
+        # Process pool of transform_many, started on first use and reused until close().
+        self.pool_parsed = 0
+        self._pool = None
+        self._pool_workers = None
+        self._pool_lock = threading.Lock()
+        if persistent_cache is not None:
+            persistent_cache.create_address_cache_table()
 
     @staticmethod
     def separate_number_from_street(token):
-        return re.sub(r'^(\d+)([A-Za-z].*)$', r'\1 \2', token)
+        return AddressParser._number_street_pattern.sub(r'\1 \2', token)
 
     @staticmethod
     def seperate_zipcode_from_city(token):
-        return re.sub(r'^([A-Za-z]+)(\d+)$', r'\1 \2', token)
+        return AddressParser._city_zipcode_pattern.sub(r'\1 \2', token)
+
+    def cache_info(self):
+        """
+        Return the address cache statistics (hits, misses, maxsize, currsize),
+        or None when the cache is disabled.
+        """
+        if self._cached_transform is None:
+            return None
+        return self._cached_transform.cache_info()
+
+    def cache_clear(self):
+        # The persistent cache keeps its entries; only its hit/miss counters restart.
+        if self._cached_transform is not None:
+            self._cached_transform.cache_clear()
+        self.persistent_hits = self.persistent_misses = 0
+        self.pool_parsed = 0
+
+    def close(self):
+        """
+        Shut down the process pool of transform_many, if one was started.
+        """
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+                self._pool_workers = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def transform_many(self, addresses, workers=None, chunksize=2000, min_parallel_size=20000):
+        """
+        Convert many raw address lines at once, returning the results in input order.
+
+        Distinct addresses are parsed only once. When there are at least
+        min_parallel_size of them and more than one worker is requested, they are
+        split into chunks of chunksize and parsed in a process pool; smaller inputs
+        fall back to the (cached) serial transform_address. The pool is started on
+        the first call that needs it and reused by later calls (its workers keep
+        their own address caches), until close(). Addresses parsed in the pool do
+        not go through this parser's cache: they are counted in pool_parsed
+        instead of cache_info().
+
+        With a persistent_cache, distinct addresses already in its Address_Cache are
+        not parsed at all, and the newly parsed ones are added to it.
+
+        Callers using workers > 1 from a script must guard the entry point with
+        `if __name__ == "__main__":` so worker processes can import it safely.
+
+        Args:
+            addresses (iterable of str): Raw address lines.
+            workers (int or None): Number of worker processes. None uses every CPU.
+            chunksize (int): Number of distinct addresses sent to a worker at a time.
+            min_parallel_size (int): Smallest number of distinct addresses worth a process pool.
+
+        Returns:
+            list of str: The transformed addresses, in the same order as the input.
+        """
+        addresses = list(addresses)
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        distinct_addresses = list(dict.fromkeys(addresses))
+        if self.persistent_cache is not None:
+            return self._transform_many_persistent(addresses, distinct_addresses, workers, chunksize,
+                                                   min_parallel_size)
+        if workers <= 1 or len(distinct_addresses) < min_parallel_size:
+            return [self.transform_address(address) for address in addresses]
+
+        parsed = self._transform_in_pool(distinct_addresses, workers, chunksize)
+        return [parsed[address] for address in addresses]
+
+    def _transform_many_persistent(self, addresses, distinct_addresses, workers, chunksize, min_parallel_size):
+        # Pipeline threads share the database connection, so they take turns using it.
+        with self._persistent_lock:
+            parsed = self.persistent_cache.get_cached_addresses(distinct_addresses, self.parser_version)
+        new_addresses = [address for address in distinct_addresses if address not in parsed]
+
+        if workers <= 1 or len(new_addresses) < min_parallel_size:
+            new_results = {address: self.transform_address(address) for address in new_addresses}
+        else:
+            new_results = self._transform_in_pool(new_addresses, workers, chunksize)
+
+        with self._persistent_lock:
+            self.persistent_cache.cache_addresses(new_results, self.parser_version)
+            self.persistent_hits += len(parsed)
+            self.persistent_misses += len(new_results)
+        parsed.update(new_results)
+        return [parsed[address] for address in addresses]
+
+    def _transform_in_pool(self, distinct_addresses, workers, chunksize):
+        # Parse distinct addresses across a process pool; returns raw address -> result.
+        chunks = [distinct_addresses[i:i + chunksize] for i in range(0, len(distinct_addresses), chunksize)]
+        parsed = {}
+        executor = self._get_pool(workers)
+        # executor.map yields chunk results in submission order.
+        for chunk, results in zip(chunks, executor.map(_transform_address_chunk, chunks)):
+            parsed.update(zip(chunk, results))
+        with self._pool_lock:
+            self.pool_parsed += len(parsed)
+        return parsed
+
+    def _get_pool(self, workers):
+        # The running pool, restarted only if a different number of workers is asked for.
+        with self._pool_lock:
+            if self._pool is not None and self._pool_workers != workers:
+                self._pool.shutdown()
+                self._pool = None
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_address_worker,
+                                                 initargs=(self.cache_size,))
+                self._pool_workers = workers
+            return self._pool
 
     def transform_address(self, raw_line):
         """
@@ -189,6 +865,8 @@ class AddressParser:
         If the line is empty -> return "EMPTY".
         If we cannot parse a ZIP (5 digits at end) -> "INCORRECT DATA".
 
+        Results are memoized on the raw line (see cache_size).
+
         Steps:
           1. Combine 'College Station' into a single token 'CollegeStation'.
           2. Identify and strip off the 5-digit ZIP from the end.
@@ -199,23 +877,28 @@ class AddressParser:
           6. Replace '#' with 'Apartment'.
           7. Rebuild final as "Street|City|State|Zip".
         """
+        if self._cached_transform is None:
+            return self._transform_address(raw_line)
+        return self._cached_transform(raw_line)
+
+    def _transform_address(self, raw_line):
         line = raw_line.strip()
         if not line:
             return "EMPTY"
 
         # 1. Merge 'College Station' into a single token "CollegeStation"
         #    This way it won't get split into separate tokens.
-        line = re.sub(r'(?i)\bcollege\s+station\b', 'CollegeStation', line)
+        line = self._college_station_pattern.sub('CollegeStation', line)
 
         # 2. Look for a 5-digit ZIP at the end
-        match_zip = re.search(r'\b(\d{5})\b\s*$', line)
+        match_zip = self._zipcode_pattern.search(line)
         if not match_zip:
             return "INCORRECT DATA"
         zip_code = match_zip.group(1)
         remainder = line[:match_zip.start()].strip(",|. ")
 
         # 3. Split on spaces or '|'
-        tokens = re.split(r'[|\s]+', remainder)
+        tokens = self._token_split_pattern.split(remainder)
         tokens = [t for t in tokens if t.strip()]
         # Address = tokens[0]
         # City
@@ -239,7 +922,7 @@ class AddressParser:
             street_tokens = tokens[:-1]
 
         # 5. Convert 'CollegeStation' → 'College Station' in the city name
-        raw_city = re.sub(r'(?i)collegestation', 'College Station', raw_city)
+        raw_city = self._merged_college_station_pattern.sub('College Station', raw_city)
 
         # Also handle "CS" => "College Station" if needed
         if raw_city.lower() == "cs":
@@ -255,9 +938,9 @@ class AddressParser:
         for t in street_tokens:
             # Replace '#' with 'Apartment'
             t = t.replace('#', 'Apartment ')
-            t = re.sub(r'(?i)Street', 'St', t)
-            t = re.sub(r'(?i)Dr\.', 'Dr', t)
-            t = re.sub(r'(?i)Circle', 'Cir', t)
+            t = self._street_pattern.sub('St', t)
+            t = self._drive_pattern.sub('Dr', t)
+            t = self._circle_pattern.sub('Cir', t)
             # Separate merged house numbers from street
             t = self.separate_number_from_street(t)
             # Strip trailing punctuation
@@ -269,3 +952,16 @@ class AddressParser:
             return "INCORRECT DATA"
 
         return f"{street}|{city}|{state}|{zip_code}"
+
+
+# Parser owned by each worker process of AddressParser.transform_many.
+_worker_address_parser = None
+
+
+def _init_address_worker(cache_size):
+    global _worker_address_parser
+    _worker_address_parser = AddressParser(cache_size=cache_size)
+
+
+def _transform_address_chunk(chunk):
+    return [_worker_address_parser.transform_address(address) for address in chunk]
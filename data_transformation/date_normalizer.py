@@ -0,0 +1,125 @@
+import threading
+from datetime import date, datetime, timedelta
+
+
+# Marker for dates stored as Excel serial day numbers (e.g. 45292 for 01/01/2024).
+EXCEL_SERIAL = "excel-serial"
+
+# Excel's day zero, accounting for its fictitious 29 February 1900.
+excel_epoch = date(1899, 12, 30)
+
+
+class DateNormalizer:
+    """
+    Normalizes raw donation dates to MM/DD/YYYY.
+
+    Donation files only hold a few hundred distinct dates a year, so every raw
+    string is parsed once and the result is cached for the rest of the run. The
+    common M/D/YYYY shapes are parsed by hand instead of through strptime, and
+    the input format of a file can be detected from a sample of its dates.
+    Dates that cannot be parsed become "" and are counted in `failures`.
+    A DateNormalizer may be shared by the transform threads of a pipelined run.
+    """
+
+    output_format = "%m/%d/%Y"
+    default_format = "%m/%d/%Y"
+    candidate_formats = ["%m/%d/%Y", "%Y-%m-%d", "%m-%d-%y", "%m-%d-%Y", "%Y/%m/%d", EXCEL_SERIAL]
+
+    def __init__(self, input_format=default_format):
+        self.input_format = input_format
+        self.failures = 0
+        self._cache = {}
+        self._failures_lock = threading.Lock()
+
+    def detect_format(self, sample):
+        """
+        Pick the input format that parses the most values in sample (an iterable of
+        raw date strings) and use it from now on. Ties go to the default M/D/YYYY.
+
+        Returns:
+            str: The detected format, or EXCEL_SERIAL.
+        """
+        values = [str(value).strip() for value in sample if value and str(value).strip()]
+        best_format, best_count = self.default_format, -1
+        for candidate in self.candidate_formats:
+            count = sum(1 for value in values if self._parse(value, candidate) is not None)
+            if count > best_count:
+                best_format, best_count = candidate, count
+        self.input_format = best_format
+        self._cache.clear()
+        return best_format
+
+    def normalize(self, raw_date):
+        """
+        Return raw_date as MM/DD/YYYY, or "" if it cannot be parsed.
+        """
+        try:
+            result = self._cache[raw_date]
+        except KeyError:
+            result = self._cache[raw_date] = self._normalize(raw_date)
+        if not result:
+            with self._failures_lock:
+                self.failures += 1
+        return result
+
+    def normalize_many(self, raw_dates):
+        return [self.normalize(raw_date) for raw_date in raw_dates]
+
+    def _normalize(self, raw_date):
+        parsed = self._parse(raw_date, self.input_format)
+        if parsed is None and self.input_format != self.default_format:
+            # Files with a detected format may still hold a few M/D/YYYY dates.
+            parsed = self._parse(raw_date, self.default_format)
+        if parsed is None:
+            return ""
+        return parsed
+
+    @classmethod
+    def _parse(cls, raw_date, input_format):
+        # Returns the normalized string, or None when raw_date is not in input_format.
+        if input_format == EXCEL_SERIAL:
+            return cls._parse_excel_serial(raw_date)
+        if input_format == "%m/%d/%Y":
+            fast_result = cls._parse_month_day_year(raw_date)
+            if fast_result is not None:
+                return fast_result or None
+        try:
+            return datetime.strptime(raw_date, input_format).strftime(cls.output_format)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _parse_month_day_year(raw_date):
+        """
+        Hand-rolled parser for plain ASCII M/D/YYYY, MM/DD/YYYY and mixes of the two.
+
+        Returns the normalized string, "" for a well-shaped but impossible date, or
+        None when the shape is anything else so the caller falls back to strptime.
+        """
+        parts = raw_date.split("/")
+        if len(parts) != 3:
+            return None
+        month, day, year = parts
+        if not (1 <= len(month) <= 2 and 1 <= len(day) <= 2 and len(year) == 4):
+            return None
+        if not (raw_date.isascii() and month.isdigit() and day.isdigit() and year.isdigit()):
+            return None
+        year_number = int(year)
+        if year_number < 1000:
+            return None  # strftime pads these years differently per platform
+        try:
+            date(year_number, int(month), int(day))
+        except ValueError:
+            return ""
+        return f"{month.zfill(2)}/{day.zfill(2)}/{year}"
+
+    @staticmethod
+    def _parse_excel_serial(raw_date):
+        try:
+            serial = float(raw_date)
+        except ValueError:
+            return None
+        # Roughly 1954 to 2119; anything else is more likely an amount or an ID.
+        if not 20000 <= serial <= 80000:
+            return None
+        return (excel_epoch + timedelta(days=int(serial))).strftime("%m/%d/%Y")
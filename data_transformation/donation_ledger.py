@@ -0,0 +1,68 @@
+import hashlib
+
+from .records import FieldReader
+
+# Columns that identify a donation in a RAW file.
+ledger_fields = ("Name", "Date", "Amount", "Fund", "Method")
+
+
+class DonationFingerprinter:
+    """
+    Picks out the donations of a RAW file that have not been processed before.
+
+    Each row is fingerprinted from its ledger_fields plus how many identical rows
+    came before it in the file, so two genuine gifts with the same name, date,
+    amount, fund and method stay distinct: in a cumulative year-to-date file the
+    second one is still the second one next month. Rows whose fingerprint is in
+    known_fingerprints (the Donation_Ledger table) are dropped; the fingerprints of
+    the new rows are collected in new_fingerprints so they can be recorded once the
+    output has been written.
+    """
+
+    def __init__(self, known_fingerprints=()):
+        self.known_fingerprints = set(known_fingerprints)
+        self.new_fingerprints = []
+        self.already_processed = 0
+        self._occurrences = {}
+        self._read_fields = FieldReader(ledger_fields)
+
+    def fingerprint(self, values):
+        # values: the raw ledger_fields of one row, in order.
+        key = "\x1f".join(str(value).strip() for value in values)
+        occurrence = self._occurrences.get(key, 0)
+        self._occurrences[key] = occurrence + 1
+        return hashlib.blake2b(f"{key}\x1e{occurrence}".encode("utf-8"), digest_size=16).digest()
+
+    def _is_new(self, values):
+        fingerprint = self.fingerprint(values)
+        if fingerprint in self.known_fingerprints:
+            self.already_processed += 1
+            return False
+        self.new_fingerprints.append(fingerprint)
+        return True
+
+    def filter_records(self, records):
+        """
+        Return the records (keyed by the RAW headers) not yet in the ledger.
+        """
+        return [row for row in records if self._is_new(self._read_fields(row))]
+
+    def mark_seen(self, records):
+        """
+        Fingerprint records as filter_records does, without keeping them: for the
+        rows already written before a resumed run, which only need to reach the ledger.
+        """
+        read_fields = self._read_fields
+        for row in records:
+            self._is_new(read_fields(row))
+
+    def filter_columns(self, columns):
+        """
+        Return a copy of a column batch (header -> list of values) holding only the
+        rows not yet in the ledger.
+        """
+        keep = [index for index, values in enumerate(zip(*(columns[field] for field in ledger_fields)))
+                if self._is_new(values)]
+        if len(keep) == len(columns[ledger_fields[0]]):
+            return columns
+        return {header: [values[index] for index in keep] for header, values in columns.items()}
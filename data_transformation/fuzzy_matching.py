@@ -0,0 +1,174 @@
+from .constants import first_name_nicknames
+
+
+soundex_codes = {}
+for letters, code in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6")):
+    for letter in letters:
+        soundex_codes[letter] = code
+
+
+def soundex(name):
+    """
+    Return the American Soundex code of a name (e.g. "Smith" and "Smyth" -> "S530").
+    Non-letters are ignored; a name without letters gives "".
+    """
+    letters = [character for character in name.lower() if "a" <= character <= "z"]
+    if not letters:
+        return ""
+    code = letters[0].upper()
+    previous = soundex_codes.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = soundex_codes.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in "hw":  # h and w do not separate letters with the same code
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def jaro_winkler(left, right, prefix_scale=0.1):
+    """
+    Return the Jaro-Winkler similarity of two strings, from 0.0 to 1.0.
+    """
+    if left == right:
+        return 1.0
+    if not left or not right:
+        return 0.0
+
+    match_distance = max(len(left), len(right)) // 2 - 1
+    left_matches = [False] * len(left)
+    right_matches = [False] * len(right)
+    matches = 0
+    for i, character in enumerate(left):
+        start = max(0, i - match_distance)
+        end = min(i + match_distance + 1, len(right))
+        for j in range(start, end):
+            if not right_matches[j] and right[j] == character:
+                left_matches[i] = right_matches[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+
+    transpositions = 0
+    j = 0
+    for i, character in enumerate(left):
+        if left_matches[i]:
+            while not right_matches[j]:
+                j += 1
+            if character != right[j]:
+                transpositions += 1
+            j += 1
+    transpositions //= 2
+
+    jaro = (matches / len(left) + matches / len(right) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for left_character, right_character in zip(left[:4], right[:4]):
+        if left_character != right_character:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def canonical_first_name(first_name):
+    # Lower-case a first name and map common nicknames to the formal name ("Jon" -> "john").
+    first_name = first_name.strip().lower()
+    return first_name_nicknames.get(first_name, first_name)
+
+
+def match_note(confidence):
+    """
+    Return the output Note for a contact found by fuzzy matching, or "" for an exact match.
+    """
+    if confidence >= 1.0:
+        return ""
+    return f"Fuzzy contact match ({confidence:.2f})"
+
+
+# Highest confidence reported for a fuzzy match; 1.0 is reserved for exact matches.
+max_fuzzy_confidence = 0.99
+
+
+class FuzzyContactIndex:
+    """
+    Approximate donor matching backed by a blocking index.
+
+    Every contact is filed under a block key made of the Soundex code of its last
+    name and the first initial of its canonical first name, so "Jon Smyth" is only
+    compared with the handful of contacts in the ("S530", "j") block rather than
+    the whole contact list. Within a block, candidates are scored with
+    Jaro-Winkler similarity (last name weighted over first name, nicknames count
+    as an exact first name match) and the best one is returned when it clears the
+    threshold and is not tied with a different contact.
+
+    A candidate whose first name scores below min_first_name_score is never a
+    match, whatever its weighted score: with the same last name, "Joan Smith" or
+    "Dana Garcia" would otherwise clear a 0.9 threshold against John Smith or
+    Daniel Garcia and be given another person's contact details. Typos such as
+    "Jhon" still score above it.
+    """
+
+    last_name_weight = 0.6
+    min_first_name_score = 0.9
+
+    def __init__(self, threshold=0.9, min_first_name_score=None):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        if min_first_name_score is not None:
+            self.min_first_name_score = min_first_name_score
+        self._blocks = {}  # block key -> list of (last lower, canonical first, record)
+
+    def __len__(self):
+        return sum(len(block) for block in self._blocks.values())
+
+    @staticmethod
+    def block_key(last_name, first_name):
+        canonical = canonical_first_name(first_name)
+        return soundex(last_name), canonical[:1]
+
+    def add(self, last_name, first_name, record):
+        candidate = (last_name.strip().lower(), canonical_first_name(first_name), record)
+        self._blocks.setdefault(self.block_key(last_name, first_name), []).append(candidate)
+
+    def match(self, last_name, first_name):
+        """
+        Return (record, confidence) for the best candidate in the name's block, or
+        (None, best score) when no single candidate reaches the threshold.
+        """
+        block = self._blocks.get(self.block_key(last_name, first_name))
+        if not block:
+            return None, 0.0
+
+        last_lower = last_name.strip().lower()
+        first_canonical = canonical_first_name(first_name)
+        best_record, best_score, runner_up_score = None, 0.0, 0.0
+        for candidate_last, candidate_first, record in block:
+            first_score = jaro_winkler(first_canonical, candidate_first)
+            if first_score < self.min_first_name_score:
+                continue  # A different person, however close the last name is
+            score = (self.last_name_weight * jaro_winkler(last_lower, candidate_last)
+                     + (1 - self.last_name_weight) * first_score)
+            if score > best_score:
+                best_record, runner_up_score, best_score = record, best_score, score
+            elif score > runner_up_score:
+                runner_up_score = score
+
+        if best_score < self.threshold or best_score == runner_up_score:
+            return None, best_score
+        # A fuzzy match is never reported with the 1.0 confidence of an exact match,
+        # even when only a nickname differs.
+        return best_record, min(round(best_score, 4), max_fuzzy_confidence)
+
+    @classmethod
+    def from_contact_index(cls, contact_index, threshold=0.9):
+        """
+        Build the blocking index from a ContactIndex. Names with more than one
+        contact are left out, since they can never be a unique match.
+        """
+        index = cls(threshold)
+        for (last_name, first_name), record in contact_index.unique_items():
+            index.add(last_name, first_name, record)
+        return index
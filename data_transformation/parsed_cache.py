@@ -0,0 +1,335 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+from .constants import parsed_cache_directory, parsed_cache_max_bytes
+from .records import record_type
+
+
+# File layout:
+#   magic | row group | row group | ... | footer JSON | footer length (8 bytes, little-endian) | magic
+#
+# A row group holds up to group_size rows, stored column by column. Each column
+# chunk is the UTF-8 encoding of the column's values joined with NUL, so loading a
+# chunk is a single decode() and split() of a slice of the memory-mapped file. A
+# None value (a short CSV row) is stored as SOH and the chunk is flagged as
+# having nulls. The footer records the source file (path, size, mtime, SHA-256),
+# the headers, and the offset and length of every column chunk.
+cache_suffix = ".colcache"
+cache_magic = b"TAMUCOL1"
+cache_version = 1
+value_separator = "\x00"
+null_marker = "\x01"
+footer_length = struct.Struct("<Q")
+
+
+def cache_path_for(source_path, cache_directory=None):
+    # One cache file per source path.
+    source_path = os.path.abspath(source_path)
+    digest = hashlib.sha256(source_path.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_directory or parsed_cache_directory,
+                        f"{os.path.basename(source_path)}.{digest}{cache_suffix}")
+
+
+def prune_cache_directory(cache_directory, keep_path, max_bytes=parsed_cache_max_bytes):
+    """
+    Remove the caches of other files with the same name as keep_path's source (so a
+    moved or replaced file does not leave its old cache behind), then the least
+    recently used caches until all of them fit in max_bytes. keep_path is never
+    removed. Returns the number of caches removed.
+    """
+    keep_name = os.path.basename(keep_path)
+    same_name_prefix = keep_name[:-len(cache_suffix) - 16]  # "<source name>."
+    caches = []
+    for entry in os.scandir(cache_directory):
+        if not entry.name.endswith(cache_suffix) or entry.name == keep_name:
+            continue
+        try:
+            status = entry.stat()
+        except OSError:
+            continue
+        # Cache names are "<source name>.<16 hex digits>.colcache", so same prefix and length means same source name.
+        same_name = entry.name.startswith(same_name_prefix) and len(entry.name) == len(keep_name)
+        caches.append((status.st_mtime, status.st_size, entry.path, same_name))
+    try:
+        total = os.path.getsize(keep_path)
+    except OSError:
+        total = 0
+    removed = 0
+    kept = []
+    for mtime, size, path, same_name in caches:
+        if same_name and _remove(path):
+            removed += 1
+        else:
+            kept.append((mtime, size, path))
+            total += size
+    for mtime, size, path in sorted(kept):  # Oldest first
+        if total <= max_bytes:
+            break
+        if _remove(path):
+            removed += 1
+            total -= size
+    return removed
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(file_path, mode="rb") as source_file:
+        for chunk in iter(lambda: source_file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedCSVCache:
+    """
+    Read side of the binary parsed-input cache of a CSV file.
+
+    open() returns None unless a cache exists for the source path and still
+    matches it: the size and modification time must be unchanged, or, if only
+    the modification time differs, the content hash must match. The cache file
+    is memory-mapped, so only the row groups actually read are paged in.
+    """
+
+    def __init__(self, cache_path, footer, cache_file, mapped):
+        self.cache_path = cache_path
+        self.headers = footer["headers"]
+        self.row_count = footer["rows"]
+        self._groups = footer["groups"]
+        self._file = cache_file
+        self._mapped = mapped
+
+    @classmethod
+    def open(cls, source_path, cache_directory=None):
+        cache_path = cache_path_for(source_path, cache_directory)
+        try:
+            cache_file = open(cache_path, mode="rb")
+        except OSError:
+            return None
+        try:
+            mapped = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+            footer = cls._read_footer(mapped)
+            if footer is None or not cls._matches_source(footer["source"], source_path):
+                mapped.close()
+                cache_file.close()
+                return None
+        except (OSError, ValueError, KeyError):
+            cache_file.close()
+            return None
+        try:
+            os.utime(cache_path)  # Marks the cache as recently used for prune_cache_directory
+        except OSError:
+            pass
+        return cls(cache_path, footer, cache_file, mapped)
+
+    @staticmethod
+    def _read_footer(mapped):
+        trailer_size = footer_length.size + len(cache_magic)
+        if len(mapped) < len(cache_magic) + trailer_size:
+            return None
+        if mapped[:len(cache_magic)] != cache_magic or mapped[-len(cache_magic):] != cache_magic:
+            return None
+        (length,) = footer_length.unpack(mapped[-trailer_size:-len(cache_magic)])
+        footer_end = len(mapped) - trailer_size
+        footer = json.loads(mapped[footer_end - length:footer_end].decode("utf-8"))
+        if footer.get("version") != cache_version:
+            return None
+        return footer
+
+    @staticmethod
+    def _matches_source(source, source_path):
+        try:
+            status = os.stat(source_path)
+        except OSError:
+            return False
+        if status.st_size != source["size"]:
+            return False
+        if status.st_mtime_ns == source["mtime_ns"]:
+            return True
+        # Touched but possibly unchanged: fall back to the content hash.
+        return file_sha256(source_path) == source["sha256"]
+
+    def close(self):
+        self._mapped.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _load_group(self, group):
+        columns = []
+        for offset, length, has_nulls in group["columns"]:
+            values = self._mapped[offset:offset + length].decode("utf-8").split(value_separator)
+            if has_nulls:
+                values = [None if value == null_marker else value for value in values]
+            columns.append(values)
+        return columns
+
+    def iter_groups(self, start_row=0):
+        """
+        Yield each row group from start_row on as a list of column value lists.
+        """
+        for group in self._groups:
+            if start_row >= group["rows"]:
+                start_row -= group["rows"]
+                continue
+            columns = self._load_group(group)
+            if start_row:
+                columns = [values[start_row:] for values in columns]
+                start_row = 0
+            yield columns
+
+    def iter_column_batches(self, batch_size, start_row=0):
+        # Same batches as CSVHandler.iter_column_batches, regrouped from the row groups.
+        pending = None
+        for columns in self.iter_groups(start_row):
+            if pending is not None:
+                columns = [left + right for left, right in zip(pending, columns)]
+                pending = None
+            row_total = len(columns[0])
+            for start in range(0, row_total, batch_size):
+                if start + batch_size > row_total:
+                    pending = [values[start:] for values in columns]
+                    break
+                yield {header: values[start:start + batch_size] for header, values in zip(self.headers, columns)}
+        if pending is not None:
+            yield dict(zip(self.headers, pending))
+
+    def iter_records(self, start_row=0):
+        # Same records as CSVHandler.iter_records.
+        Record = record_type(self.headers)
+        for columns in self.iter_groups(start_row):
+            for values in zip(*columns):
+                yield Record(*values)
+
+
+class ParsedCSVCacheBuilder:
+    """
+    Write side of the parsed-input cache, fed the rows of a CSV while it is read.
+
+    Rows go to a temporary file one row group at a time and the cache is only
+    moved into place by finish() once the whole file has been read, so a partial
+    read never leaves a partial cache. Files the format cannot represent exactly
+    (rows longer than the header, values containing NUL, values equal to the null
+    marker) are given up on and simply not cached. Once a cache is in place, the
+    caches of other files with the same name and the least recently used caches
+    beyond max_cache_bytes are removed (see prune_cache_directory).
+    """
+
+    group_size = 65536
+
+    def __init__(self, source_path, headers, cache_directory=None, max_cache_bytes=parsed_cache_max_bytes):
+        self.source_path = os.path.abspath(source_path)
+        self.max_cache_bytes = max_cache_bytes
+        self.headers = list(headers)
+        self.cache_path = cache_path_for(source_path, cache_directory)
+        self._source_status = os.stat(source_path)
+        self._rows = []
+        self._groups = []
+        self._row_count = 0
+        self._abandoned = False
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        self._temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        self._file = open(self._temp_path, mode="wb")
+        self._file.write(cache_magic)
+
+    def add_row(self, values):
+        # values: one CSV row as a list, padded with None to the header width.
+        if self._abandoned:
+            return
+        if len(values) != len(self.headers):
+            self.abandon()
+            return
+        self._rows.append(values)
+        if len(self._rows) >= self.group_size:
+            rows, self._rows = self._rows, []
+            self._write_group(rows)
+
+    def add_rows(self, rows):
+        # rows: a list of CSV rows, each padded with None to the header width.
+        if self._abandoned or not rows:
+            return
+        if max(map(len, rows)) != len(self.headers):
+            self.abandon()
+            return
+        self._rows.extend(rows)
+        while len(self._rows) >= self.group_size and not self._abandoned:
+            group_rows = self._rows[:self.group_size]
+            del self._rows[:self.group_size]
+            self._write_group(group_rows)
+
+    def _write_group(self, rows):
+        group = {"rows": len(rows), "columns": []}
+        for values in zip(*rows):
+            has_nulls = None in values
+            if has_nulls:
+                if null_marker in values:
+                    self.abandon()
+                    return
+                values = [null_marker if value is None else value for value in values]
+            text = value_separator.join(values)
+            if text.count(value_separator) != len(values) - 1:
+                self.abandon()
+                return
+            data = text.encode("utf-8")
+            group["columns"].append([self._file.tell(), len(data), has_nulls])
+            self._file.write(data)
+        self._groups.append(group)
+        self._row_count += group["rows"]
+
+    def finish(self):
+        """
+        Write the footer and move the cache into place. Returns the cache path,
+        or None if the file could not be cached.
+        """
+        if self._abandoned:
+            return None
+        try:
+            if self._rows:
+                rows, self._rows = self._rows, []
+                self._write_group(rows)
+            if self._abandoned:
+                return None
+            status = os.stat(self.source_path)
+            if (status.st_size, status.st_mtime_ns) != (self._source_status.st_size, self._source_status.st_mtime_ns):
+                self.abandon()  # The source changed while it was being read
+                return None
+            footer = {
+                "version": cache_version,
+                "source": {"path": self.source_path, "size": status.st_size,
+                           "mtime_ns": status.st_mtime_ns, "sha256": file_sha256(self.source_path)},
+                "headers": self.headers,
+                "rows": self._row_count,
+                "groups": self._groups,
+            }
+            footer_bytes = json.dumps(footer).encode("utf-8")
+            self._file.write(footer_bytes)
+            self._file.write(footer_length.pack(len(footer_bytes)))
+            self._file.write(cache_magic)
+            self._file.close()
+            os.replace(self._temp_path, self.cache_path)
+            prune_cache_directory(os.path.dirname(self.cache_path), self.cache_path, self.max_cache_bytes)
+            return self.cache_path
+        except OSError:
+            self.abandon()
+            return None
+
+    def abandon(self):
+        self._abandoned = True
+        self._rows = []
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
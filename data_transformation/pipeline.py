@@ -0,0 +1,125 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Marks the end of a stage's output on a queue.
+_end_of_stream = object()
+
+
+def run_pipeline(source, transform, sink, workers=0, queue_size=4):
+    """
+    Run source -> transform -> sink, optionally as a concurrent pipeline.
+
+    source is an iterable of work items (e.g. chunks of records), transform(item)
+    returns the result for one item and sink(item, result) consumes results in the
+    same order as the items came from source.
+
+    With workers=0 everything runs one item at a time on the calling thread. With
+    workers >= 1, a reader thread pulls items from source, a pool of `workers`
+    threads transforms them and a writer thread feeds the results to sink, so
+    reading and writing overlap with transformation. The stages are connected by
+    queues holding at most queue_size items: when the writer falls behind, the
+    transform stage stops taking new items, and when the transform stage falls
+    behind, the reader stops reading, so memory stays bounded.
+
+    The first exception raised by any stage stops the pipeline and is re-raised
+    here once every thread has finished. Items already handed to sink stay done.
+
+    Returns:
+        int: Number of items passed to sink.
+    """
+    if workers < 0:
+        raise ValueError("workers must be 0 or more")
+    if queue_size < 1:
+        raise ValueError("queue_size must be at least 1")
+
+    if workers == 0:
+        count = 0
+        for item in source:
+            sink(item, transform(item))
+            count += 1
+        return count
+
+    read_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+    written = [0]
+
+    def fail(error):
+        if not errors:
+            errors.append(error)
+        stop.set()
+
+    def put(target_queue, item):
+        # Block while the queue is full, unless another stage has failed.
+        while not stop.is_set():
+            try:
+                target_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(source_queue):
+        while not stop.is_set():
+            try:
+                return source_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _end_of_stream
+
+    def read():
+        iterator = iter(source)
+        try:
+            for item in iterator:
+                if not put(read_queue, item):
+                    break
+        except BaseException as e:
+            fail(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            put(read_queue, _end_of_stream)
+
+    def write():
+        try:
+            while True:
+                entry = get(write_queue)
+                if entry is _end_of_stream:
+                    return
+                item, future = entry
+                result = future.result()
+                if stop.is_set():
+                    return
+                sink(item, result)
+                written[0] += 1
+        except BaseException as e:
+            fail(e)
+
+    reader = threading.Thread(target=read, name="pipeline-reader", daemon=True)
+    writer = threading.Thread(target=write, name="pipeline-writer", daemon=True)
+    reader.start()
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline-transform") as executor:
+            while True:
+                item = get(read_queue)
+                if item is _end_of_stream:
+                    break
+                # Futures are queued in read order, so the writer sees results in that order.
+                if not put(write_queue, (item, executor.submit(transform, item))):
+                    break
+            put(write_queue, _end_of_stream)
+    except BaseException as e:
+        fail(e)
+    finally:
+        writer.join()
+        stop.set()  # Unblocks the reader if the pipeline ended early
+        reader.join()
+
+    if errors:
+        raise errors[0]
+    return written[0]
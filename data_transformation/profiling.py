@@ -0,0 +1,128 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+
+
+class RunProfiler:
+    """
+    Profiling of one transformation run (run_data_transformation.py --profile).
+
+    Stage times come from the run's RunStats. On top of them the profiler tracks
+    peak memory with tracemalloc and, in "functions" mode, runs cProfile over the
+    transformation so the report also ranks the functions the time went to
+    (transform_address, the contact lookups, strptime, csv reading and writing...).
+
+    cProfile only sees the thread it was enabled on and neither profiler sees
+    worker processes, so profile with --pipeline-workers 0 for the function
+    ranking. Both profilers slow the run down: compare profiles with profiles,
+    not with normal runs.
+    """
+
+    modes = ("stages", "functions")
+
+    def __init__(self, mode="stages", top=30):
+        if mode not in self.modes:
+            raise ValueError(f"Unknown profile mode '{mode}'. Expected one of: {', '.join(self.modes)}")
+        self.mode = mode
+        self.top = top
+        self.peak_memory_bytes = None
+        self._profile = cProfile.Profile() if mode == "functions" else None
+
+    def start(self):
+        # Start tracking memory; call as early as possible so the peak covers the whole run.
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    @contextmanager
+    def profiling(self):
+        """
+        Run the enclosed block under cProfile (in "functions" mode).
+        """
+        if self._profile is None:
+            yield
+            return
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            self._profile.disable()
+
+    def _function_ranking(self):
+        # The top functions by time spent in the function itself, most expensive first.
+        function_stats = pstats.Stats(self._profile).stats
+        ranking = []
+        for (file_name, line, function), (_, calls, own_seconds, cumulative_seconds, _) in function_stats.items():
+            ranking.append({
+                "function": function,
+                "file": file_name,
+                "line": line,
+                "calls": calls,
+                "own_seconds": round(own_seconds, 6),
+                "cumulative_seconds": round(cumulative_seconds, 6),
+            })
+        ranking.sort(key=lambda entry: entry["own_seconds"], reverse=True)
+        return ranking[:self.top]
+
+    def to_dict(self, stats):
+        run = stats.to_dict()
+        stages = sorted(run["stages"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+        report = {
+            "mode": self.mode,
+            "run_seconds": run["run_seconds"],
+            "peak_memory_mb": (round(self.peak_memory_bytes / (1024 * 1024), 2)
+                               if self.peak_memory_bytes is not None else None),
+            "stages": [dict(stage, name=name) for name, stage in stages],
+            "counters": run["counters"],
+        }
+        if self._profile is not None:
+            report["functions"] = self._function_ranking()
+        return report
+
+    def format_report(self, stats):
+        """
+        Return the report as text: stages by time, then (in "functions" mode) the
+        cProfile listing of the top functions by own time.
+        """
+        report = self.to_dict(stats)
+        lines = [f"Profile ({report['mode']}), {report['run_seconds']:.2f}s total"]
+        if report["peak_memory_mb"] is not None:
+            lines.append(f"Peak traced memory: {report['peak_memory_mb']:.1f} MB")
+        lines.append("")
+        lines.append(f"  {'stage':<20} {'seconds':>10} {'share':>7} {'rows/s':>12}")
+        for stage in report["stages"]:
+            share = stage["seconds"] / report["run_seconds"] if report["run_seconds"] else 0.0
+            rate = f"{stage['rows_per_second']:,.0f}" if stage.get("rows_per_second") else "-"
+            lines.append(f"  {stage['name']:<20} {stage['seconds']:>10.3f} {share:>7.1%} {rate:>12}")
+        if self._profile is not None:
+            listing = io.StringIO()
+            pstats.Stats(self._profile, stream=listing).sort_stats("tottime").print_stats(self.top)
+            lines.append("")
+            lines.append(listing.getvalue().strip("\n"))
+        return "\n".join(lines)
+
+    def write_reports(self, stats, output_path):
+        """
+        Write the text and JSON reports next to output_path (the run's output CSV)
+        and return their paths.
+        """
+        base_path = output_path
+        for extension in (".gz", ".zst", ".csv"):
+            if base_path.endswith(extension):
+                base_path = base_path[:-len(extension)]
+        text_path = f"{base_path}_profile.txt"
+        json_path = f"{base_path}_profile.json"
+        os.makedirs(os.path.dirname(os.path.abspath(text_path)), exist_ok=True)
+        with open(text_path, mode="w", encoding="utf-8") as text_file:
+            text_file.write(self.format_report(stats) + "\n")
+        with open(json_path, mode="w", encoding="utf-8") as json_file:
+            json.dump(self.to_dict(stats), json_file, indent=2)
+        return text_path, json_path
@@ -0,0 +1,164 @@
+import keyword
+import operator
+
+
+class CompactRecord:
+    """
+    Base class of the row types made by record_type().
+
+    A record stores one CSV row in __slots__ (one per header, plus one for values
+    beyond the last header), so it costs a fraction of the memory of the dict
+    csv.DictReader builds for every row. It still reads like that dict:
+    record["Address"], record.get("Account"), record["Address"] = ... and
+    to_dict() all work, with missing trailing values as None and extra values
+    under the None key.
+
+    Hot loops should not look fields up by header name one at a time; use
+    field_getter() to build a single C-level getter for the fields they need.
+    """
+
+    __slots__ = ()
+    headers = ()
+    _attributes = {}  # header -> slot name
+    _missing = None   # Target of getters for headers the file does not have
+
+    def __getitem__(self, header):
+        try:
+            return getattr(self, self._attributes[header])
+        except KeyError:
+            if header is None and self._rest is not None:
+                return self._rest
+            raise KeyError(header) from None
+
+    def __setitem__(self, header, value):
+        try:
+            setattr(self, self._attributes[header], value)
+        except KeyError:
+            raise KeyError(f"{header!r} is not a column of this file") from None
+
+    def __contains__(self, header):
+        if header is None:
+            return self._rest is not None
+        return header in self._attributes
+
+    def get(self, header, default=None):
+        attribute = self._attributes.get(header)
+        if attribute is None:
+            return self._rest if header is None and self._rest is not None else default
+        return getattr(self, attribute)
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def to_dict(self):
+        record = {header: getattr(self, attribute) for header, attribute in self._attributes.items()}
+        if self._rest is not None:
+            record[None] = self._rest
+        return record
+
+    def __eq__(self, other):
+        if isinstance(other, (CompactRecord, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, CompactRecord) else other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+_record_types = {}
+
+
+def _attribute_names(headers):
+    # A valid, unique slot name per header; headers that are not plain identifiers get a positional name.
+    names = []
+    for position, header in enumerate(headers):
+        name = header if isinstance(header, str) else ""
+        if not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_") or name in names \
+                or hasattr(CompactRecord, name):
+            name = f"_field_{position}"
+        names.append(name)
+    return names
+
+
+def record_type(headers):
+    """
+    Return the CompactRecord subclass for rows with the given headers, creating it
+    on first use. Build a record from a csv.reader row with RecordType(*row).
+    """
+    headers = tuple(headers)
+    cached = _record_types.get(headers)
+    if cached is not None:
+        return cached
+
+    attributes = _attribute_names(headers)
+    # As in csv.DictReader, a repeated header maps to its last column.
+    attribute_of = {header: attribute for header, attribute in zip(headers, attributes)}
+
+    # A generated __init__ (as collections.namedtuple does) fills every slot at C speed;
+    # short rows leave trailing fields as None and extra values are kept in _rest.
+    # Its own parameters are _self_ and _rest_: slot names never start with "_" unless
+    # they are _field_<n>, so a column named "self" or "_rest" cannot clash with them.
+    parameters = "".join(f", {attribute}=None" for attribute in attributes)
+    assignments = "".join(f"    _self_.{attribute} = {attribute}\n" for attribute in attributes)
+    source = (f"def __init__(_self_{parameters}, *_rest_):\n"
+              f"{assignments}"
+              f"    _self_._rest = list(_rest_) if _rest_ else None\n")
+    namespace = {}
+    exec(source, namespace)
+
+    cls = type("Record", (CompactRecord,), {
+        "__slots__": tuple(attributes) + ("_rest",),
+        "__init__": namespace["__init__"],
+        "headers": headers,
+        "_attributes": attribute_of,
+    })
+    _record_types[headers] = cls
+    return cls
+
+
+def field_getter(record_class, fields):
+    """
+    Return a function that takes a record and returns a tuple of the given fields,
+    with None for fields the file does not have. record_class may be a
+    CompactRecord subclass (a single operator.attrgetter) or dict (plain .get()).
+    """
+    fields = tuple(fields)
+    if isinstance(record_class, type) and issubclass(record_class, CompactRecord):
+        names = [record_class._attributes.get(field, "_missing") for field in fields]
+        if len(names) == 1:
+            getter = operator.attrgetter(names[0])
+            return lambda record: (getter(record),)
+        return operator.attrgetter(*names)
+    return lambda record: tuple(record.get(field) for field in fields)
+
+
+class FieldReader:
+    """
+    Callable that returns a tuple of the given fields from a record, keeping one
+    field_getter() per record type it sees (CompactRecord subclasses or dicts).
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._getters = {}
+
+    def __call__(self, record):
+        try:
+            getter = self._getters[type(record)]
+        except KeyError:
+            getter = self._getters[type(record)] = field_getter(type(record), self.fields)
+        return getter(record)
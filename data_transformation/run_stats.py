@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class RunStats:
+    """
+    Collects per-stage wall time and row counters for one transformation run.
+
+    Stage timers are exclusive: when one stage starts while another is running
+    (for example a generator pulling rows from the CSV reader), the outer stage's
+    clock is paused until the inner one finishes. This way the streaming pipeline
+    reports the time spent in each stage rather than in everything upstream of it.
+
+    A RunStats can be shared by the threads of a pipelined run: each thread keeps
+    its own stage stack, so stage times are the busy time summed over threads and
+    can add up to more than the run's wall time.
+    """
+
+    def __init__(self):
+        self.stage_seconds = {}
+        self.stage_items = Counter()
+        self.counters = Counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._run_start = time.perf_counter()
+        self._run_seconds = None
+
+    @property
+    def _stack(self):
+        # [stage name, start time] of the stages currently running on this thread
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _push(self, name):
+        now = time.perf_counter()
+        stack = self._stack
+        if stack:
+            self._charge(stack[-1], now)
+        stack.append([name, now])
+
+    def _pop(self):
+        now = time.perf_counter()
+        stack = self._stack
+        self._charge(stack.pop(), now)
+        if stack:
+            stack[-1][1] = now
+
+    def _charge(self, entry, now):
+        name, start = entry
+        with self._lock:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + (now - start)
+        entry[1] = now
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time the enclosed block as part of the given stage.
+        """
+        self._push(name)
+        try:
+            yield
+        finally:
+            self._pop()
+
+    def timed_iter(self, name, iterable, size=None):
+        """
+        Yield from iterable, charging the time spent producing each item to the
+        given stage and counting the rows produced. size, if given, returns the
+        number of rows in an item (for iterables that yield batches of rows).
+        """
+        iterator = iter(iterable)
+        while True:
+            self._push(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._pop()
+            with self._lock:
+                self.stage_items[name] += 1 if size is None else size(item)
+            yield item
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def finish(self):
+        # Stop the overall run clock.
+        self._run_seconds = time.perf_counter() - self._run_start
+
+    @property
+    def run_seconds(self):
+        if self._run_seconds is None:
+            return time.perf_counter() - self._run_start
+        return self._run_seconds
+
+    def to_dict(self):
+        stages = {}
+        for name, seconds in self.stage_seconds.items():
+            stage = {"seconds": round(seconds, 6)}
+            if name in self.stage_items:
+                stage["rows"] = self.stage_items[name]
+                stage["rows_per_second"] = round(self.stage_items[name] / seconds, 1) if seconds else None
+            stages[name] = stage
+        return {
+            "run_seconds": round(self.run_seconds, 6),
+            "stages": stages,
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def write_json(self, file_path):
+        with open(file_path, mode="w", encoding="utf-8") as json_file:
+            json_file.write(self.to_json())
+
+    def summary(self):
+        """
+        Return a human readable summary of the run.
+        """
+        lines = [f"Run summary ({self.run_seconds:.2f}s total)"]
+        for name, seconds in self.stage_seconds.items():
+            line = f"  {name:<20} {seconds:>10.3f}s"
+            rows = self.stage_items.get(name)
+            if rows:
+                rate = f"{rows / seconds:,.0f} rows/s" if seconds else "n/a"
+                line += f"  {rows:>10} rows  {rate}"
+            lines.append(line)
+        for name, count in sorted(self.counters.items()):
+            lines.append(f"  {name:<20} {count:>10}")
+        return "\n".join(lines)
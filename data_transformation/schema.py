@@ -0,0 +1,178 @@
+import itertools
+import operator
+
+from .constants import required_headers, output_headers
+from .date_normalizer import DateNormalizer
+from .records import FieldReader
+
+
+class SchemaError(Exception):
+    """Raised when the output schema does not line up with the RAW or output headers."""
+
+
+# Cleanups of RAW values, by the name used in output_columns. "date" is bound to the
+# file's DateNormalizer when the schema is compiled.
+value_transforms = {
+    "strip": lambda value: str(value).strip(),
+    "amount": lambda value: str(value).strip().replace("$", ""),
+    "title": lambda value: str(value).strip().title(),
+    "lower_title": lambda value: str(value).strip().lower().title(),
+    "capitalize": lambda value: str(value).strip().capitalize(),
+    "date": None,
+}
+
+# Values the transformation works out per row (name splitting, address parsing and
+# contact enrichment), passed to the compiled schema as a tuple in this order.
+derived_fields = ("first_name", "last_name", "organization", "address", "city", "state", "zipcode",
+                  "phone", "email", "note")
+
+
+def raw(header, transform="strip"):
+    # Output column copied from a RAW column, cleaned by a value_transforms entry.
+    return ("raw", header, transform)
+
+
+def derived(name):
+    # Output column filled from one of the derived_fields.
+    return ("derived", name)
+
+
+def constant(value=""):
+    return ("constant", value)
+
+
+# Where each output column comes from, in output order.
+output_columns = {
+    "Title": constant(),
+    "First Name": derived("first_name"),
+    "Middle Name": constant(),
+    "Last Name": derived("last_name"),
+    "Suffix": constant(),
+    "Organization": derived("organization"),
+    "Home Address": derived("address"),
+    "Home City": derived("city"),
+    "Home State": derived("state"),
+    "Home Zip Code": derived("zipcode"),
+    "Phone1": derived("phone"),
+    "Phone2": constant(),
+    "Email": derived("email"),
+    "Date": raw("Date", "date"),
+    "Amount": raw("Amount", "amount"),
+    "Fund": raw("Fund", "lower_title"),
+    "Campaign": raw("Campaign", "title"),
+    "Appeal": raw("Appeal"),
+    "Method": raw("Method", "capitalize"),
+    "Acknowledged?": constant(),
+    "Note": derived("note"),
+}
+
+
+class OutputSchema:
+    """
+    Declarative mapping from RAW rows to output rows, checked against
+    required_headers and output_headers when it is created so a misaligned
+    mapping fails at startup instead of shifting columns in the output.
+
+    compile() turns it into a CompiledSchema whose row builders do the lookups
+    once: per row, the RAW values are pulled out with a single
+    attrgetter/itemgetter call, cleaned, and the output columns are picked
+    with one itemgetter.
+    """
+
+    def __init__(self, columns, input_headers=required_headers, expected_headers=output_headers):
+        self.columns = dict(columns)
+        self.headers = list(self.columns)
+        self._validate(input_headers, expected_headers)
+        # RAW columns in the order the compiled extractor returns them.
+        self.raw_fields = tuple(dict.fromkeys(spec[1] for spec in self.columns.values() if spec[0] == "raw"))
+
+    def _validate(self, input_headers, expected_headers):
+        problems = []
+        if self.headers != list(expected_headers):
+            missing = [header for header in expected_headers if header not in self.columns]
+            unexpected = [header for header in self.headers if header not in expected_headers]
+            problems.append(f"output columns {self.headers} do not match output_headers {list(expected_headers)}"
+                            f" (missing: {missing}, unexpected: {unexpected})")
+        for header, spec in self.columns.items():
+            kind = spec[0]
+            if kind == "raw":
+                if spec[1] not in input_headers:
+                    problems.append(f"{header!r} reads {spec[1]!r}, which is not in required_headers")
+                if spec[2] not in value_transforms:
+                    problems.append(f"{header!r} uses unknown transform {spec[2]!r}")
+            elif kind == "derived":
+                if spec[1] not in derived_fields:
+                    problems.append(f"{header!r} uses unknown derived field {spec[1]!r}")
+            elif kind != "constant":
+                problems.append(f"{header!r} has unknown source kind {kind!r}")
+        if problems:
+            raise SchemaError("Invalid output schema:\n  " + "\n  ".join(problems))
+
+    def compile(self, date_normalizer=None):
+        return CompiledSchema(self, date_normalizer if date_normalizer is not None else DateNormalizer())
+
+
+class CompiledSchema:
+    """
+    Row builders of an OutputSchema for one file (bound to its DateNormalizer).
+
+    build_row(record, derived) returns one output row as a list, from a RAW
+    record and a tuple of derived_fields values.
+    build_rows(columns, derived_columns) returns output rows as tuples, from a
+    batch of RAW columns (header -> list of values) and one list per derived
+    field, all of the same length.
+    """
+
+    def __init__(self, schema, date_normalizer):
+        self.headers = list(schema.headers)
+        self.raw_fields = schema.raw_fields
+        normalize = date_normalizer.normalize
+        transforms = dict(value_transforms, date=lambda value: normalize(str(value).strip()))
+
+        specs = list(schema.columns.values())
+        raw_specs = [spec for spec in specs if spec[0] == "raw"]
+        raw_transforms = [transforms[spec[2]] for spec in raw_specs]
+        constants = [spec[1] for spec in specs if spec[0] == "constant"]
+
+        # build_row lines a row up as [cleaned RAW values, derived values, constants]
+        # and picks the output columns from that list with a single itemgetter.
+        positions = []
+        raw_count = constant_count = 0
+        for spec in specs:
+            if spec[0] == "raw":
+                positions.append(raw_count)
+                raw_count += 1
+            elif spec[0] == "derived":
+                positions.append(len(raw_specs) + derived_fields.index(spec[1]))
+            else:
+                positions.append(len(raw_specs) + len(derived_fields) + constant_count)
+                constant_count += 1
+        extract = FieldReader(spec[1] for spec in raw_specs)
+        pick = operator.itemgetter(*positions)
+
+        def build_row(record, derived):
+            values = [transform(value) for transform, value in zip(raw_transforms, extract(record))]
+            values += derived
+            values += constants
+            return list(pick(values))
+
+        def build_rows(columns, derived_columns):
+            # One source per output column, zipped into rows; constants repeat.
+            cleaned = iter([[transform(value) for value in columns[spec[1]]]
+                            for transform, spec in zip(raw_transforms, raw_specs)])
+            sources = []
+            for spec in specs:
+                if spec[0] == "raw":
+                    sources.append(next(cleaned))
+                elif spec[0] == "derived":
+                    sources.append(derived_columns[derived_fields.index(spec[1])])
+                else:
+                    sources.append(itertools.repeat(spec[1]))
+            return list(zip(*sources))
+
+        self.build_row = build_row
+        self.build_rows = build_rows
+
+
+# Built (and validated) when the package is imported.
+output_schema = OutputSchema(output_columns)
@@ -5,37 +5,153 @@ Created on Wed Apr  2 21:15:57 2025
 @author: marcu
 """
 
+import argparse
 import csv
+import os
+import tempfile
+import zlib
 
-def keep_unique_rows(input_csv, output_csv):
-    seen = set()       # will hold tuples like (LastN, FirstN)
-    unique_rows = []   # store the rows we want to keep
+# What to keep when several rows share a key:
+#   first - the first row seen (the original behaviour)
+#   last  - the last row seen
+#   merge - the first row, with empty columns filled in from later duplicates
+dedup_policies = ("first", "last", "merge")
+
+
+def _merge_non_empty(kept_row, new_row):
+    # Fill the kept row's empty values from a later duplicate.
+    for column, value in new_row.items():
+        if not (kept_row.get(column) or "").strip() and (value or "").strip():
+            kept_row[column] = value
+    return kept_row
+
+
+def _apply_policy(groups, key, row, policy):
+    if key not in groups or policy == "last":
+        groups[key] = row
+    elif policy == "merge":
+        _merge_non_empty(groups[key], row)
 
-    # Read from input_csv
-    with open(input_csv, 'r', newline='', encoding='utf-8') as infile:
-        # If your file is truly tab-delimited, use delimiter='\t'
-        reader = csv.DictReader(infile, delimiter=',')
 
-        for row in reader:
-            # Create a tuple key based on (LastN, FirstN)
-            key = (row['LastN'], row['FirstN'])
-            if key not in seen:
-                seen.add(key)
-                unique_rows.append(row)
+def _partition_of(key, partition_count):
+    # A stable hash, so a key always lands in the same spill file.
+    return zlib.crc32("\x1f".join(key).encode("utf-8")) % partition_count
 
-    # Write unique rows to output_csv
-    with open(output_csv, 'w', newline='', encoding='utf-8') as outfile:
+
+def keep_unique_rows(input_csv, output_csv, key_columns=("LastN", "FirstN"), policy="first",
+                     max_keys_in_memory=1_000_000, partition_count=64, spill_directory=None):
+    """
+    Write the rows of input_csv to output_csv, keeping one row per key.
+
+    Rows are streamed: with the "first" policy unique rows are written as soon as
+    they are found. Once more than max_keys_in_memory distinct keys have been seen,
+    the remaining rows are spilled to partition_count hash-partitioned files on disk
+    (in spill_directory, or the system temp directory) and each partition is then
+    de-duplicated on its own, so inputs far larger than RAM can be handled. Rows that
+    were spilled are written after the in-memory rows, in input order per partition.
+
+    Args:
+        input_csv (str): Path of the CSV to de-duplicate.
+        output_csv (str): Path to write the unique rows to.
+        key_columns (sequence of str): Columns that together identify a duplicate.
+        policy (str): "first", "last" or "merge" (see dedup_policies).
+        max_keys_in_memory (int): Distinct keys held in memory before spilling to disk.
+        partition_count (int): Number of spill files.
+        spill_directory (str or None): Where spill files are created.
+
+    Returns:
+        tuple: (rows read, rows written)
+    """
+    if policy not in dedup_policies:
+        raise ValueError(f"Unknown policy '{policy}'. Expected one of: {', '.join(dedup_policies)}")
+    key_columns = list(key_columns)
+
+    rows_read = 0
+    rows_written = 0
+    with open(input_csv, 'r', newline='', encoding='utf-8') as infile, \
+            open(output_csv, 'w', newline='', encoding='utf-8') as outfile, \
+            tempfile.TemporaryDirectory(dir=spill_directory) as spill_root:
+        # If your file is truly tab-delimited, use delimiter='\t'
+        reader = csv.DictReader(infile, delimiter=',')
         # Use the same fieldnames and delimiter as the input
-        fieldnames = reader.fieldnames
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames, delimiter=',')
+        fieldnames = reader.fieldnames or []
+        missing_columns = [column for column in key_columns if column not in fieldnames]
+        if missing_columns:
+            raise ValueError(f"Key columns not found in {input_csv}: {', '.join(missing_columns)}")
 
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames, delimiter=',')
         # Write header row
         writer.writeheader()
+
+        seen = set()    # keys handled in memory ("first" policy)
+        groups = {}     # key -> row to keep ("last" and "merge" policies)
+        spill_writers = None
+        spill_files = []
+
+        def open_spill_files():
+            for partition in range(partition_count):
+                spill_file = open(os.path.join(spill_root, f"partition_{partition}.csv"), 'w',
+                                  newline='', encoding='utf-8')
+                spill_files.append(spill_file)
+            return [csv.DictWriter(spill_file, fieldnames=fieldnames) for spill_file in spill_files]
+
+        try:
+            for row in reader:
+                rows_read += 1
+                # Create a tuple key based on the key columns
+                key = tuple(row[column] or "" for column in key_columns)
+
+                if spill_writers is None:
+                    if policy == "first":
+                        if key not in seen:
+                            seen.add(key)
+                            writer.writerow(row)
+                            rows_written += 1
+                    else:
+                        _apply_policy(groups, key, row, policy)
+                    if len(seen) + len(groups) > max_keys_in_memory:
+                        spill_writers = open_spill_files()
+                        # Rows still being merged go to disk ahead of their later duplicates.
+                        for group_key, group_row in groups.items():
+                            spill_writers[_partition_of(group_key, partition_count)].writerow(group_row)
+                        groups.clear()
+                elif policy != "first" or key not in seen:
+                    spill_writers[_partition_of(key, partition_count)].writerow(row)
+        finally:
+            for spill_file in spill_files:
+                spill_file.close()
+
         # Write only the unique rows we collected
-        writer.writerows(unique_rows)
+        writer.writerows(groups.values())
+        rows_written += len(groups)
+
+        # De-duplicate each partition on its own; every copy of a key is in the same one.
+        for spill_file in spill_files:
+            partition_groups = {}
+            with open(spill_file.name, 'r', newline='', encoding='utf-8') as partition_file:
+                for row in csv.DictReader(partition_file, fieldnames=fieldnames):
+                    key = tuple(row[column] or "" for column in key_columns)
+                    _apply_policy(partition_groups, key, row, policy)
+            writer.writerows(partition_groups.values())
+            rows_written += len(partition_groups)
+
+    return rows_read, rows_written
+
 
 if __name__ == "__main__":
-    input_path = "C:/Users/marcu/Downloads/Contact_Info.csv"
-    output_path = "C:/Users/marcu/Downloads/Unique_Contact_Info.csv"
-    keep_unique_rows(input_path, output_path)
-    print(f"Unique rows have been written to {output_path}")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Remove duplicate rows from a CSV file.")
+    parser.add_argument("input_path", nargs="?", default="C:/Users/marcu/Downloads/Contact_Info.csv")
+    parser.add_argument("output_path", nargs="?", default="C:/Users/marcu/Downloads/Unique_Contact_Info.csv")
+    parser.add_argument("--key", nargs="+", default=["LastN", "FirstN"],
+                        help="Columns that identify a duplicate (default: LastN FirstN).")
+    parser.add_argument("--policy", choices=dedup_policies, default="first",
+                        help="Which duplicate to keep: first, last, or merge non-empty values.")
+    parser.add_argument("--max-keys-in-memory", type=int, default=1_000_000,
+                        help="Distinct keys kept in memory before spilling to disk.")
+    parser.add_argument("--spill-dir", help="Directory for temporary spill files.")
+    args = parser.parse_args()
+
+    rows_read, rows_written = keep_unique_rows(args.input_path, args.output_path, key_columns=args.key,
+                                               policy=args.policy, max_keys_in_memory=args.max_keys_in_memory,
+                                               spill_directory=args.spill_dir)
+    print(f"Read {rows_read} rows; {rows_written} unique rows have been written to {args.output_path}")
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from data_transformation.data_transformation import AddressParser, DatabaseConfig, DatabaseConnector
+
+
+addresses = ["100 Main Street Bryan TX 77801", "", "no zip here", "2 Oak Dr. College Station 77840",
+             "100 Main Street Bryan TX 77801"] * 3
+
+
+def test_pool_results_match_serial_and_pool_is_reused():
+    serial = AddressParser().transform_many(addresses, workers=1)
+    with AddressParser() as parser:
+        first = parser.transform_many(addresses, workers=2, chunksize=2, min_parallel_size=1)
+        pool = parser._pool
+        second = parser.transform_many(addresses, workers=2, chunksize=2, min_parallel_size=1)
+        assert parser._pool is pool
+        assert first == second == serial
+        assert parser.pool_parsed == 2 * len(set(addresses))
+    assert parser._pool is None
+
+
+def test_threads_share_one_pool():
+    # As the --pipeline-workers transform threads do.
+    serial = AddressParser().transform_many(addresses, workers=1)
+    with AddressParser() as parser:
+        with ThreadPoolExecutor(max_workers=3) as threads:
+            results = list(threads.map(
+                lambda _: (parser.transform_many(addresses, workers=2, chunksize=2, min_parallel_size=1),
+                           parser._pool),
+                range(3)))
+        assert all(result == serial for result, _ in results)
+        assert len({id(pool) for _, pool in results}) == 1
+
+
+def connect(path):
+    return DatabaseConnector(backend="memory", config=DatabaseConfig(path=str(path)))
+
+
+def test_second_run_reads_addresses_from_the_address_cache(tmp_path, monkeypatch):
+    expected = AddressParser().transform_many(addresses, workers=1)
+    with connect(tmp_path / "contacts.db") as database_conn:
+        parser = AddressParser(persistent_cache=database_conn)
+        assert parser.transform_many(addresses, workers=1) == expected
+        assert (parser.persistent_hits, parser.persistent_misses) == (0, len(set(addresses)))
+
+    def reparse(self, raw_line):
+        raise AssertionError(f"{raw_line!r} was parsed again")
+
+    monkeypatch.setattr(AddressParser, "_transform_address", reparse)
+    with connect(tmp_path / "contacts.db") as database_conn:
+        parser = AddressParser(persistent_cache=database_conn)
+        assert parser.transform_many(addresses, workers=1) == expected
+        assert (parser.persistent_hits, parser.persistent_misses) == (len(set(addresses)), 0)
+
+
+def test_entries_of_other_parser_versions_are_not_used(tmp_path, monkeypatch):
+    address = addresses[0]
+    expected = AddressParser().transform_address(address)
+    with connect(tmp_path / "contacts.db") as database_conn:
+        AddressParser(persistent_cache=database_conn)
+        database_conn.cache_addresses({address: "OLD|FORMAT"}, AddressParser.parser_version - 1)
+        parser = AddressParser(persistent_cache=database_conn)
+        assert parser.transform_many([address], workers=1) == [expected]
+        assert parser.persistent_misses == 1
+
+        # A new parser version reparses what the current one cached, and pruning
+        # drops every entry but its own.
+        monkeypatch.setattr(AddressParser, "parser_version", AddressParser.parser_version + 1)
+        database_conn.cache_addresses({address: "CHANGED|ENTRY"}, AddressParser.parser_version - 1)
+        parser = AddressParser(persistent_cache=database_conn)
+        assert parser.transform_many([address], workers=1) == [expected]
+        assert parser.persistent_misses == 1
+        assert database_conn.prune_address_cache(AddressParser.parser_version) == 2
+        assert database_conn.get_cached_addresses([address], AddressParser.parser_version) == {address: expected}
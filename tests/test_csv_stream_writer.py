@@ -0,0 +1,65 @@
+import gzip
+
+import pytest
+
+from data_transformation import csv_handler
+from data_transformation.csv_handler import CSVStreamWriter
+
+
+rows = [["Name", "Amount", "Note"], ["Smith, John", "25.00", "line one\nline two"], ["Doe", "", "\"quoted\""]]
+
+
+def write_rows(path, **options):
+    with CSVStreamWriter(str(path), **options) as output_stream:
+        output_stream.write_rows(rows)
+    with open(path, mode="rb") as output_file:
+        return output_file.read()
+
+
+def fail_while_writing(path, **options):
+    with pytest.raises(RuntimeError):
+        with CSVStreamWriter(str(path), atomic=True, **options) as output_stream:
+            output_stream.write_rows(rows)
+            output_stream.flush()
+            raise RuntimeError("disk full")
+
+
+def test_atomic_write_renames_the_part_file(tmp_path):
+    path = tmp_path / "out.csv"
+    assert write_rows(path, atomic=True) == write_rows(tmp_path / "plain.csv")
+    assert not (tmp_path / "out.csv.part").exists()
+
+
+def test_failed_write_leaves_no_file(tmp_path):
+    fail_while_writing(tmp_path / "out.csv")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_write_keeps_the_part_file_with_keep_partial(tmp_path):
+    fail_while_writing(tmp_path / "out.csv", keep_partial=True)
+    assert [path.name for path in tmp_path.iterdir()] == ["out.csv.part"]
+    assert (tmp_path / "out.csv.part").read_bytes() == write_rows(tmp_path / "plain.csv")
+
+
+def test_gzip_output_decompresses_to_the_same_csv(tmp_path):
+    expected = write_rows(tmp_path / "plain.csv")
+    assert gzip.decompress(write_rows(tmp_path / "out.csv.gz", compression="gzip", atomic=True)) == expected
+
+
+def test_zstd_output_decompresses_to_the_same_csv(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    expected = write_rows(tmp_path / "plain.csv")
+    compressed = write_rows(tmp_path / "out.csv.zst", compression="zstd", atomic=True)
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(compressed) == expected
+
+
+def test_zstd_without_zstandard_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_handler, "zstandard", None)
+    with pytest.raises(ValueError, match="zstandard"):
+        CSVStreamWriter(str(tmp_path / "out.csv.zst"), compression="zstd")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_compressed_output_cannot_be_resumed(tmp_path):
+    with pytest.raises(ValueError, match="cannot be resumed"):
+        CSVStreamWriter(str(tmp_path / "out.csv.gz"), resume_offset=0, compression="gzip")
@@ -0,0 +1,62 @@
+from data_transformation.data_transformation import DatabaseConfig, DatabaseConnector
+
+
+def contact(donor_id, last_name, first_name):
+    return {"Donor_ID": donor_id, "Last_Name": last_name, "First_Name": first_name, "Address": "1 Main St",
+            "City": "Bryan", "State": "TX", "Zipcode": "77801", "Phone": "", "Email": ""}
+
+
+def test_bulk_insert_keeps_the_configured_pragmas(tmp_path):
+    config = DatabaseConfig(path=str(tmp_path / "contacts.db"), journal_mode="WAL", synchronous="NORMAL")
+    with DatabaseConnector(config=config) as database_conn:
+        database_conn.create_table()
+        inserted, duplicates = database_conn.bulk_insert_records([contact(1, "Smith", "John"),
+                                                                  contact(1, "Smith", "Jane")])
+        assert (inserted, duplicates) == (1, [1])
+        assert database_conn.cursor.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert database_conn.cursor.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_bulk_insert_restores_opted_in_pragmas(tmp_path):
+    config = DatabaseConfig(path=str(tmp_path / "contacts.db"))
+    with DatabaseConnector(config=config) as database_conn:
+        database_conn.create_table()
+        database_conn.bulk_insert_records([contact(1, "Smith", "John")], journal_mode="memory", synchronous="off")
+        assert database_conn.cursor.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert database_conn.cursor.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def donors(database_conn):
+    database_conn.cursor.execute("SELECT Donor_ID, Last_Name, First_Name FROM Donors ORDER BY Last_Name")
+    return database_conn.cursor.fetchall()
+
+
+def test_sync_contact_list_applies_only_the_differences():
+    with DatabaseConnector(config=DatabaseConfig(path=":memory:")) as database_conn:
+        summary = database_conn.sync_contact_list([contact("003", "Smith", "John"), contact(4, "Doe", "Jane"),
+                                                   contact(5, "Lee", "Ann")], "first file")
+        assert (summary["inserted"], summary["updated"], summary["deleted"], summary["unchanged"]) == (3, 0, 0, 0)
+        assert donors(database_conn) == [(4, "Doe", "Jane"), (5, "Lee", "Ann"), (3, "Smith", "John")]
+
+        # "3" is the donor stored from "003"; 4 changes, 5 is gone, 6 and "A-7" are new.
+        summary = database_conn.sync_contact_list([contact("3", "Smith", "John"), contact(4, "Doe", "Janet"),
+                                                   contact(6, "Cruz", "Ana"), contact("A-7", "Kim", "Min"),
+                                                   contact("0004", "Doe", "Duplicate")], "second file")
+        assert (summary["inserted"], summary["updated"], summary["deleted"], summary["unchanged"]) == (2, 1, 1, 1)
+        assert summary["duplicate_ids"] == ["0004"]
+        assert donors(database_conn) == [(6, "Cruz", "Ana"), (4, "Doe", "Janet"), ("A-7", "Kim", "Min"),
+                                         (3, "Smith", "John")]
+
+        # The non-numeric ID matches itself on the next sync instead of being re-inserted.
+        summary = database_conn.sync_contact_list([contact(3, "Smith", "John"), contact(4, "Doe", "Janet"),
+                                                   contact(6, "Cruz", "Ana"), contact("A-7", "Kim", "Min")],
+                                                  "third file")
+        assert (summary["inserted"], summary["updated"], summary["deleted"], summary["unchanged"]) == (0, 0, 0, 4)
+
+
+def test_sync_contact_list_skips_a_file_it_has_applied():
+    with DatabaseConnector(config=DatabaseConfig(path=":memory:")) as database_conn:
+        database_conn.sync_contact_list([contact(1, "Smith", "John")], "same file")
+        summary = database_conn.sync_contact_list([contact(2, "Doe", "Jane")], "same file")
+        assert summary["skipped"] is True
+        assert donors(database_conn) == [(1, "Smith", "John")]
@@ -0,0 +1,29 @@
+from data_transformation.donation_ledger import DonationFingerprinter
+
+
+rows = [
+    {"Name": "smith|john", "Date": "1/2/2024", "Amount": "$10", "Fund": "general", "Method": "check"},
+    {"Name": "doe|jane", "Date": "1/3/2024", "Amount": "$25", "Fund": "general", "Method": "cash"},
+    {"Name": "smith|john", "Date": "1/2/2024", "Amount": "$10", "Fund": "general", "Method": "check"},
+]
+
+
+def test_repeated_donations_stay_distinct():
+    fingerprinter = DonationFingerprinter()
+    assert fingerprinter.filter_records(rows) == rows
+    assert len(set(fingerprinter.new_fingerprints)) == 3
+
+    next_run = DonationFingerprinter(fingerprinter.new_fingerprints)
+    assert next_run.filter_records(rows + rows[:1]) == rows[:1]
+    assert next_run.already_processed == 3
+
+
+def test_mark_seen_matches_filter_records():
+    filtered = DonationFingerprinter()
+    filtered.filter_records(iter(rows))
+    marked = DonationFingerprinter()
+    assert marked.mark_seen(iter(rows)) is None
+    assert marked.new_fingerprints == filtered.new_fingerprints
+    # Rows after the prefix are fingerprinted as if the run had not been interrupted.
+    assert marked.filter_records(rows[:1]) == rows[:1]
+    assert marked.new_fingerprints[-1] != filtered.new_fingerprints[0]
@@ -0,0 +1,54 @@
+from data_transformation.fuzzy_matching import FuzzyContactIndex, jaro_winkler, max_fuzzy_confidence
+
+
+def make_index(threshold=0.9):
+    index = FuzzyContactIndex(threshold)
+    index.add("Smith", "John", "john smith")
+    index.add("Garcia", "Daniel", "daniel garcia")
+    return index
+
+
+def test_same_last_name_different_first_name_is_not_a_match():
+    index = make_index()
+    for last_name, first_name in (("Smith", "Joan"), ("Smith", "Josh"), ("Garcia", "Dana")):
+        record, _ = index.match(last_name, first_name)
+        assert record is None, (last_name, first_name)
+
+
+def test_weighted_score_alone_would_have_matched():
+    # The cases above clear the threshold on the weighted score; the first-name floor rejects them.
+    for first_name, candidate in (("joan", "john"), ("josh", "john"), ("dana", "daniel")):
+        first_score = jaro_winkler(first_name, candidate)
+        assert 0.6 + 0.4 * first_score >= 0.9
+        assert first_score < FuzzyContactIndex.min_first_name_score
+
+
+def test_nicknames_and_typos_still_match():
+    index = make_index()
+    assert index.match("Smyth", "Jon")[0] == "john smith"
+    assert index.match("Smith", "Jhon")[0] == "john smith"
+    record, confidence = index.match("Smith", "Johnny")
+    assert record == "john smith"
+    assert confidence == max_fuzzy_confidence
+
+
+def test_tied_candidates_are_not_a_match():
+    index = FuzzyContactIndex(0.9)
+    index.add("Smyth", "John", "first")
+    index.add("Smyth", "John", "second")
+    record, score = index.match("Smith", "John")
+    assert record is None
+    assert score >= 0.9
+
+
+def test_best_candidate_wins_over_runner_up():
+    index = FuzzyContactIndex(0.9)
+    index.add("Smyth", "John", "smyth")
+    index.add("Smythe", "John", "smythe")
+    assert index.match("Smith", "John")[0] == "smyth"
+
+
+def test_min_first_name_score_is_configurable():
+    index = FuzzyContactIndex(0.9, min_first_name_score=0.8)
+    index.add("Smith", "John", "john smith")
+    assert index.match("Smith", "Joan")[0] == "john smith"
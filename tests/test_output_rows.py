@@ -0,0 +1,90 @@
+import pytest
+
+from data_transformation.columnar import ColumnarTransformer
+from data_transformation.constants import output_headers
+from data_transformation.csv_handler import CSVHandler
+from data_transformation.data_transformation import AddressParser, DatabaseConfig, DatabaseConnector
+from data_transformation.date_normalizer import DateNormalizer
+from data_transformation.name_classifier import NameClassifier
+from data_transformation.run_stats import RunStats
+from data_transformation.schema import OutputSchema, SchemaError, output_columns, output_schema, raw
+from run_data_transformation import clean_addresses, headers, transform_records
+
+
+# A repeated header ("Fund": the last column wins), a row with extra values, a short
+# row (no Account), an anonymous gift, an organization and an unparseable date.
+raw_csv = (
+    "Name,Date,Amount,Fund,Campaign,Appeal,Method,Address,Fund,Account\n"
+    "smith|john,1/2/2024,$25.00,ignored,spring drive,Mailer,CHECK,100 Main Street Bryan TX 77801,general fund,a1\n"
+    "doe|jane,01/03/2024,$10,ignored,,,credit card,2 Oak Dr. College Station 77840,BUILDING FUND,a2,extra,more\n"
+    "anonymous,1/4/2024,$5,x,,,cash,,general,a3\n"
+    "acme church,2024-13-01,\"$1,000\",x,gala,,Check,,general,a4\n"
+    "lee,1/5/2024,$7,x,,,check,no zip,general\n"
+)
+
+expected_rows = [
+    ["", "John", "", "Smith", "", "", "9 Elm St", "Bryan", "TX", "77802", "555-0100", "", "john@example.com",
+     "01/02/2024", "25.00", "General Fund", "Spring Drive", "Mailer", "Check", "", ""],
+    ["", "Jane", "", "Doe", "", "", "2 Oak Dr", "College Station", "TX", "77840", "", "", "",
+     "01/03/2024", "10", "Building Fund", "", "", "Credit card", "", ""],
+    ["", "", "", "", "", "Acme Church", "1 Church Rd", "Waco", "TX", "76701", "", "", "info@acme.org",
+     "", "1,000", "General", "Gala", "", "Check", "", ""],
+    ["", "", "", "Lee", "", "", "", "", "", "", "", "", "",
+     "01/05/2024", "7", "General", "", "", "Check", "", ""],
+]
+
+contacts = [
+    {"Donor_ID": 1, "Last_Name": "Smith", "First_Name": "John", "Address": "9 Elm St", "City": "Bryan",
+     "State": "TX", "Zipcode": "77802", "Phone": "555-0100", "Email": "john@example.com"},
+    {"Donor_ID": 2, "Last_Name": "Acme Church", "First_Name": "Acme Church", "Address": "1 Church Rd",
+     "City": "Waco", "State": "TX", "Zipcode": "76701", "Phone": "", "Email": "info@acme.org"},
+]
+
+
+@pytest.fixture
+def raw_path(tmp_path):
+    path = tmp_path / "2024_RAW.csv"
+    path.write_text(raw_csv, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def database_conn():
+    with DatabaseConnector(backend="memory", config=DatabaseConfig(path=":memory:")) as database_conn:
+        database_conn.create_table()
+        database_conn.bulk_insert_records(contacts)
+        yield database_conn
+
+
+def test_row_engine_output(raw_path, database_conn):
+    stats = RunStats()
+    records = clean_addresses(CSVHandler(raw_path).iter_records(), AddressParser(), stats, workers=1)
+    rows = list(transform_records(records, database_conn, stats, NameClassifier(), DateNormalizer()))
+    assert rows == expected_rows
+    assert stats.counters["anonymous_skipped"] == 1
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+def test_columnar_engine_output(raw_path, database_conn, batch_size):
+    transformer = ColumnarTransformer(database_conn, AddressParser(), NameClassifier(), RunStats(), workers=1,
+                                      date_normalizer=DateNormalizer())
+    rows = [list(row) for batch in CSVHandler(raw_path).iter_column_batches(batch_size=batch_size)
+            for row in transformer.transform_batch(batch)]
+    assert rows == expected_rows
+
+
+def test_header_row_matches_the_rows():
+    assert headers == output_headers
+    assert all(len(row) == len(headers) for row in expected_rows)
+
+
+def test_misaligned_schema_fails_at_creation():
+    renamed = dict(output_columns)
+    renamed["Phone 2"] = renamed.pop("Phone2")
+    with pytest.raises(SchemaError):
+        OutputSchema(renamed)
+    with pytest.raises(SchemaError):
+        OutputSchema(dict(output_columns, Fund=raw("Funds")))
+    with pytest.raises(SchemaError):
+        OutputSchema(dict(output_columns, Fund=raw("Fund", "unknown")))
+    assert output_schema.headers == output_headers
@@ -0,0 +1,95 @@
+import os
+
+from data_transformation.csv_handler import CSVHandler
+from data_transformation.parsed_cache import ParsedCSVCache, ParsedCSVCacheBuilder, cache_path_for
+
+
+csv_text = (
+    "Name,Date,Amount,Address\r\n"
+    "smith|john,01/02/2024,$10,\"100 Main St\nBryan TX 77801\"\r\n"
+    "\r\n"
+    "doe|jane,01/03/2024\r\n"
+    "\"acme, inc\",01/04/2024,$5,\"\"\r\n"
+    "\r\n"
+    "\r\n"
+    "lee|ann,01/05/2024,$7,\"2 Oak Dr, College Station 77840\"\r\n"
+    "roe|rick,,,\r\n"
+)
+
+
+def write_csv(directory, name="2024_RAW.csv", text=csv_text):
+    path = os.path.join(directory, name)
+    with open(path, mode="w", encoding="utf-8", newline="") as csv_file:
+        csv_file.write(text)
+    return path
+
+
+def read_records(path, cache_directory, start_row=0):
+    handler = CSVHandler(path, use_cache=True, cache_directory=cache_directory)
+    return [record.to_dict() for record in handler.iter_records(start_row)]
+
+
+def read_batches(path, cache_directory, batch_size, start_row=0):
+    handler = CSVHandler(path, use_cache=True, cache_directory=cache_directory)
+    return list(handler.iter_column_batches(batch_size=batch_size, start_row=start_row))
+
+
+def test_cold_and_warm_records_match(tmp_path):
+    path = write_csv(str(tmp_path))
+    cache_directory = str(tmp_path / "cache")
+    uncached = [record.to_dict() for record in CSVHandler(path).iter_records()]
+
+    cold = read_records(path, cache_directory)
+    assert os.path.exists(cache_path_for(path, cache_directory))
+    warm = read_records(path, cache_directory)
+
+    assert cold == warm == uncached
+    assert len(warm) == 5  # Blank lines skipped
+    assert warm[0]["Address"] == "100 Main St\nBryan TX 77801"  # Embedded newline
+    assert warm[1]["Amount"] is None and warm[1]["Address"] is None  # Short row
+    assert warm[2]["Name"] == "acme, inc" and warm[2]["Address"] == ""
+    for start_row in range(7):
+        assert read_records(path, cache_directory, start_row) == uncached[start_row:]
+
+
+def test_cold_and_warm_column_batches_match(tmp_path):
+    path = write_csv(str(tmp_path))
+    for batch_size in (1, 2, 3, 10):
+        cache_directory = str(tmp_path / f"cache_{batch_size}")
+        uncached = list(CSVHandler(path).iter_column_batches(batch_size=batch_size))
+        cold = read_batches(path, cache_directory, batch_size)
+        warm = read_batches(path, cache_directory, batch_size)
+        # Blank lines do not count towards a batch, so every batch but the last is full.
+        assert [len(batch["Name"]) for batch in cold][:-1] == [batch_size] * (len(cold) - 1)
+        assert cold == warm == uncached
+        for start_row in range(1, 6):
+            assert read_batches(path, cache_directory, batch_size, start_row) == \
+                list(CSVHandler(path).iter_column_batches(batch_size=batch_size, start_row=start_row))
+
+
+def test_changed_source_is_not_served_from_cache(tmp_path):
+    path = write_csv(str(tmp_path))
+    cache_directory = str(tmp_path / "cache")
+    read_records(path, cache_directory)
+    write_csv(str(tmp_path), text=csv_text.replace("$10", "$99"))
+    assert ParsedCSVCache.open(path, cache_directory) is None
+    assert read_records(path, cache_directory)[0]["Amount"] == "$99"
+
+
+def test_caches_are_pruned(tmp_path):
+    cache_directory = str(tmp_path / "cache")
+    os.makedirs(tmp_path / "a")
+    first = write_csv(str(tmp_path / "a"))
+    read_records(first, cache_directory)
+    # The same file name in another directory replaces the first file's cache.
+    os.makedirs(tmp_path / "b")
+    moved = write_csv(str(tmp_path / "b"))
+    read_records(moved, cache_directory)
+    assert sorted(os.listdir(cache_directory)) == [os.path.basename(cache_path_for(moved, cache_directory))]
+
+    # Beyond the size cap, the least recently used caches go.
+    other = write_csv(str(tmp_path), name="2023_RAW.csv")
+    builder = ParsedCSVCacheBuilder(other, ["Name", "Date", "Amount", "Address"], cache_directory, max_cache_bytes=1)
+    builder.add_rows([["x", "y", "z", "w"]])
+    assert builder.finish() == cache_path_for(other, cache_directory)
+    assert os.listdir(cache_directory) == [os.path.basename(cache_path_for(other, cache_directory))]
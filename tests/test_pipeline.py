@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from data_transformation.pipeline import run_pipeline
+
+
+class Source:
+    """
+    Items 0..count-1, recording how many were read and whether the reader closed it.
+    """
+
+    def __init__(self, count, fail_at=None):
+        self.count = count
+        self.fail_at = fail_at
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        try:
+            for item in range(self.count):
+                if item == self.fail_at:
+                    raise OSError("read failed")
+                self.read += 1
+                yield item
+        finally:
+            self.closed = True
+
+
+def slow_square(item):
+    # Early items take longest, so later results are ready first.
+    time.sleep(0.002 * (item % 5))
+    return item * item
+
+
+def pipeline_threads():
+    return [thread.name for thread in threading.enumerate() if thread.name.startswith("pipeline-")]
+
+
+@pytest.mark.parametrize("workers", [0, 1, 2, 4])
+def test_results_reach_the_sink_in_source_order(workers):
+    written = []
+    count = run_pipeline(Source(40), slow_square, lambda item, result: written.append((item, result)),
+                         workers=workers, queue_size=2)
+    assert count == 40
+    assert written == [(item, item * item) for item in range(40)]
+
+
+@pytest.mark.parametrize("workers", [0, 1, 3])
+def test_transform_error_stops_the_pipeline(workers):
+    source = Source(1000)
+    written = []
+
+    def transform(item):
+        if item == 7:
+            raise ValueError("bad chunk")
+        return item
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        run_pipeline(source, transform, lambda item, result: written.append(item), workers=workers, queue_size=2)
+    # Everything before the failing item was written, nothing after it.
+    assert written == list(range(7))
+    assert source.read < 1000
+    assert source.closed
+    assert pipeline_threads() == []
+
+
+def test_source_and_sink_errors_are_raised():
+    source = Source(100, fail_at=10)
+    with pytest.raises(OSError, match="read failed"):
+        run_pipeline(source, slow_square, lambda item, result: None, workers=2)
+    assert source.closed
+
+    def sink(item, result):
+        if item == 3:
+            raise RuntimeError("write failed")
+
+    source = Source(1000)
+    with pytest.raises(RuntimeError, match="write failed"):
+        run_pipeline(source, slow_square, sink, workers=2, queue_size=2)
+    assert source.read < 1000
+    assert pipeline_threads() == []
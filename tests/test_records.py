@@ -0,0 +1,75 @@
+import csv
+import io
+
+import pytest
+
+from data_transformation.records import FieldReader, field_getter, record_type
+
+
+csv_text = (
+    "Name,Home Zip Code,Acknowledged?,class,_private,Fund,Fund\n"
+    "smith|john,77801,yes,a,b,first fund,second fund\n"
+    "doe|jane,77840\n"
+    "lee|ann,77802,no,c,d,e,f,extra one,extra two\n"
+)
+
+
+def read_both():
+    # The same rows as csv.DictReader dicts and as records built from csv.reader rows.
+    expected = list(csv.DictReader(io.StringIO(csv_text)))
+    reader = csv.reader(io.StringIO(csv_text))
+    Record = record_type(next(reader))
+    return expected, [Record(*row) for row in reader]
+
+
+def test_records_read_like_dict_reader_rows():
+    expected, records = read_both()
+    assert [record.to_dict() for record in records] == expected
+    assert records == expected
+    for record, row in zip(records, expected):
+        for header in ("Name", "Home Zip Code", "Acknowledged?", "class", "_private", "Fund", None):
+            assert record.get(header) == row.get(header)
+            assert (header in record) == (header in row)
+
+
+def test_short_rows_extra_values_and_repeated_headers():
+    _, (full, short, long) = read_both()
+    assert full["Fund"] == "second fund"  # A repeated header maps to its last column
+    assert short["Acknowledged?"] is None and short["Fund"] is None
+    assert None not in short
+    assert long[None] == ["extra one", "extra two"]
+    assert long.get("Missing", "default") == "default"
+
+
+def test_assignment_and_unknown_headers():
+    _, (record, _, _) = read_both()
+    record["Home Zip Code"] = "77845"
+    assert record["Home Zip Code"] == "77845"
+    with pytest.raises(KeyError):
+        record["Missing"] = "x"
+
+
+def test_headers_named_like_init_parameters():
+    text = "self,_rest,_self_,_rest_,Name\n1,2,3,4,smith|john,extra\n"
+    expected = list(csv.DictReader(io.StringIO(text)))
+    reader = csv.reader(io.StringIO(text))
+    Record = record_type(next(reader))
+    records = [Record(*row) for row in reader]
+    assert records == expected
+    assert records[0]["self"] == "1" and records[0]["_rest"] == "2"
+    assert records[0][None] == ["extra"]
+
+
+def test_field_getters_match_for_records_and_dicts():
+    expected, records = read_both()
+    fields = ("Fund", "Missing", "class", "Name")
+    read_fields = FieldReader(fields)
+    for record, row in zip(records, expected):
+        assert read_fields(record) == read_fields(row) == tuple(row.get(field) for field in fields)
+    single = field_getter(type(records[0]), ["Home Zip Code"])
+    assert single(records[1]) == ("77840",)
+
+
+def test_record_types_are_shared_per_header_set():
+    assert record_type(["A", "B"]) is record_type(("A", "B"))
+    assert record_type(["A", "B"]) is not record_type(["B", "A"])
@@ -0,0 +1,128 @@
+import glob
+import os
+
+import pytest
+
+import run_data_transformation
+from data_transformation.checkpoint import RunCheckpoint
+from data_transformation.csv_handler import CSVHandler, CSVStreamWriter
+
+
+contacts_csv = (
+    "Donor_ID,Last_Name,First_Name,Address,City,State,Zipcode,Phone,Email\n"
+    "1,Smith,John,9 Elm St,Bryan,TX,77802,555-0100,john@example.com\n"
+    "2,Doe,Jane,4 Pine Ln,Waco,TX,76701,,jane@example.com\n"
+)
+
+names = ["smith|john", "doe|jane", "lee|ann", "anonymous", "acme church"]
+
+
+def raw_csv(rows=47):
+    lines = ["Name,Date,Amount,Fund,Campaign,Appeal,Method,Address"]
+    for index in range(rows):
+        lines.append(f"{names[index % len(names)]},1/{index % 28 + 1}/2024,${index + 1}.00,general fund,"
+                     f"spring drive,Mailer,check,{index} Main Street Bryan TX 77801")
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    """
+    Return a function that runs run_data_transformation.main() on 2024_RAW.csv
+    with the given extra arguments and returns the output directory.
+    """
+    raw_path = tmp_path / "2024_RAW.csv"
+    raw_path.write_text(raw_csv(), encoding="utf-8")
+    contacts_path = tmp_path / "contacts.csv"
+    contacts_path.write_text(contacts_csv, encoding="utf-8")
+
+    def prompt(handler):
+        handler._set_file_name(str(raw_path))
+        return str(raw_path)
+
+    monkeypatch.setattr(CSVHandler, "_prompt_for_file", prompt)
+
+    def output_directory(home):
+        return str(tmp_path / home / "Downloads" / "TAMU_Selfless_Service" / "Phase_Two_Formatted_Data")
+
+    def run_main(home, *arguments):
+        monkeypatch.setenv("HOME", str(tmp_path / home))
+        run_data_transformation.main(["--contacts", str(contacts_path), "--database",
+                                      str(tmp_path / f"{home}.db"), *arguments])
+        return output_directory(home)
+
+    run_main.raw_path = raw_path
+    run_main.output_directory = output_directory
+    return run_main
+
+
+def fail_on_write(monkeypatch, call_number):
+    # Make the call_number-th write_rows write half of its rows, then fail.
+    original = CSVStreamWriter.write_rows
+    calls = [0]
+
+    def write_rows(self, rows, batch_size=1000):
+        calls[0] += 1
+        if calls[0] == call_number:
+            rows = list(rows)
+            original(self, rows[:len(rows) // 2])
+            self.flush()
+            raise RuntimeError("disk full")
+        return original(self, rows, batch_size)
+
+    monkeypatch.setattr(CSVStreamWriter, "write_rows", write_rows)
+    return original
+
+
+def output_bytes(output_directory):
+    (path,) = glob.glob(os.path.join(output_directory, "*.csv"))
+    with open(path, mode="rb") as output_file:
+        return output_file.read()
+
+
+@pytest.mark.parametrize("engine", ["row", "columnar"])
+def test_resumed_run_matches_uninterrupted_run(run, monkeypatch, engine):
+    arguments = ["--engine", engine, "--checkpoint-every", "10"]
+    expected = output_bytes(run("full", *arguments))
+
+    original = fail_on_write(monkeypatch, 3)
+    with pytest.raises(SystemExit):
+        run("resumed", "--resume", *arguments)
+    output_directory = run.output_directory("resumed")
+    (checkpoint_path,) = glob.glob(os.path.join(output_directory, "*.checkpoint.json"))
+    assert RunCheckpoint(checkpoint_path).load()["rows_processed"] == 20
+    assert not glob.glob(os.path.join(output_directory, "*.csv"))
+
+    monkeypatch.setattr(CSVStreamWriter, "write_rows", original)
+    run("resumed", "--resume", *arguments)
+    assert output_bytes(output_directory) == expected
+    assert not glob.glob(os.path.join(output_directory, "*.checkpoint.json"))
+    assert not glob.glob(os.path.join(output_directory, "*.part"))
+
+
+def test_changed_input_starts_over(run, monkeypatch, capsys):
+    original = fail_on_write(monkeypatch, 2)
+    with pytest.raises(SystemExit):
+        run("changed", "--resume", "--checkpoint-every", "10")
+    monkeypatch.setattr(CSVStreamWriter, "write_rows", original)
+
+    run.raw_path.write_text(raw_csv(rows=30), encoding="utf-8")
+    expected = output_bytes(run("full", "--checkpoint-every", "10"))
+    capsys.readouterr()
+    output_directory = run("changed", "--resume", "--checkpoint-every", "10")
+    assert "The input file changed since the checkpoint was saved" in capsys.readouterr().out
+    assert output_bytes(output_directory) == expected
+
+
+def test_checkpoint_of_another_input_is_ignored(tmp_path):
+    partial_path = tmp_path / "out.csv.part"
+    partial_path.write_text("header\nrow\n", encoding="utf-8")
+    checkpoint = RunCheckpoint(str(tmp_path / "run.checkpoint.json"))
+    checkpoint.save("in.csv", "fingerprint-a", 1, str(tmp_path / "out.csv"), 11, 1, partial_path=str(partial_path))
+    assert checkpoint.load_matching("in.csv", "fingerprint-a")["rows_processed"] == 1
+    assert checkpoint.load_matching("in.csv", "fingerprint-b") is None
+
+
+def test_resume_refuses_compressed_output():
+    with pytest.raises(SystemExit):
+        run_data_transformation.parse_arguments(["--resume", "--compress", "gzip"])
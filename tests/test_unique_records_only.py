@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+from data_transformation_utility_scripts.unique_records_only import dedup_policies, keep_unique_rows
+
+
+def contact_rows(count=60):
+    # Every key appears several times; later copies fill in some of the empty phones and emails.
+    rows = []
+    for index in range(count):
+        person = index % 17
+        rows.append({
+            "LastN": f"Last{person % 9}",
+            "FirstN": f"First{person}",
+            "Phone": f"555-{index:04d}" if index % 3 == 0 else "",
+            "Email": f"{index}@example.com" if index % 4 == 1 else "",
+        })
+    return rows
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    path = tmp_path / "contacts.csv"
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=["LastN", "FirstN", "Phone", "Email"])
+        writer.writeheader()
+        writer.writerows(contact_rows())
+    return str(path)
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+def expected_rows(policy, key_columns=("LastN", "FirstN")):
+    # The rows each policy keeps, worked out independently of keep_unique_rows.
+    kept = {}
+    for row in contact_rows():
+        key = tuple(row[column] for column in key_columns)
+        if key not in kept or policy == "last":
+            kept[key] = dict(row)
+        elif policy == "merge":
+            for column, value in row.items():
+                if not kept[key][column] and value:
+                    kept[key][column] = value
+    return list(kept.values())
+
+
+@pytest.mark.parametrize("policy", dedup_policies)
+def test_spilled_output_matches_in_memory_output(input_csv, tmp_path, policy):
+    in_memory_csv = str(tmp_path / "in_memory.csv")
+    spilled_csv = str(tmp_path / "spilled.csv")
+    in_memory_counts = keep_unique_rows(input_csv, in_memory_csv, policy=policy)
+    spilled_counts = keep_unique_rows(input_csv, spilled_csv, policy=policy, max_keys_in_memory=3,
+                                      partition_count=4, spill_directory=str(tmp_path))
+
+    assert read_rows(in_memory_csv) == expected_rows(policy)
+    # Spilled rows come out per partition, so only the order may differ.
+    sort_key = lambda row: (row["LastN"], row["FirstN"])
+    assert sorted(read_rows(spilled_csv), key=sort_key) == sorted(expected_rows(policy), key=sort_key)
+    assert in_memory_counts == spilled_counts == (60, 17)
+    assert [path.name for path in tmp_path.iterdir() if path.is_dir()] == []
+
+
+def test_other_key_columns(input_csv, tmp_path):
+    output_csv = str(tmp_path / "unique.csv")
+    keep_unique_rows(input_csv, output_csv, key_columns=["LastN"], max_keys_in_memory=2, partition_count=3)
+    assert sorted(row["LastN"] for row in read_rows(output_csv)) == [f"Last{person}" for person in range(9)]
+
+
+def test_missing_key_column(input_csv, tmp_path):
+    with pytest.raises(ValueError, match="Key columns not found.*: Zip"):
+        keep_unique_rows(input_csv, str(tmp_path / "unique.csv"), key_columns=["LastN", "Zip"])
+
+
+def test_unknown_policy(input_csv, tmp_path):
+    with pytest.raises(ValueError, match="Unknown policy"):
+        keep_unique_rows(input_csv, str(tmp_path / "unique.csv"), policy="newest")